@@ -0,0 +1,91 @@
+import multiprocessing
+import random
+import weakref
+
+from agents.Group14.Rollout import INCREMENTAL, rollout
+from src.BitBoard import BitBoard
+from src.Board import Board
+from src.Colour import Colour
+
+
+def run_rollouts(task: tuple) -> tuple[int, int]:
+    """Plays a batch of rollouts from one position in a worker process and
+    returns the number won by red and by blue.
+    """
+
+    board_size, packed, colour, rollouts, rollout_policy, seed = task
+    random.seed(seed)
+
+    bits = BitBoard.from_bytes(board_size, packed)
+    board = Board.from_stones(board_size, bits.red, bits.blue)
+    # only the incremental policy plays its stones onto the board
+    snapshot = board.snapshot()
+
+    red_wins = blue_wins = 0
+    for _ in range(rollouts):
+        winner = rollout(rollout_policy, board, colour)
+        if winner == Colour.RED:
+            red_wins += 1
+        elif winner == Colour.BLUE:
+            blue_wins += 1
+        if rollout_policy == INCREMENTAL:
+            board.restore(snapshot)
+    return red_wins, blue_wins
+
+
+def _terminate(pool):
+    if pool is not None:
+        pool.terminate()
+
+
+class LeafParallelRollouts:
+    """Leaf parallelisation: the position at a newly expanded leaf is sent
+    to every worker, each plays rollouts_per_worker rollouts from it and
+    the win counts are added up, so one tree iteration backs up
+    workers * rollouts_per_worker results.
+
+    Positions travel as BitBoard.to_bytes buffers rather than pickled
+    boards. The pool is started when the object is created and reused for
+    every leaf. A daemonic process, such as a HexTournament game worker,
+    may not start children, so there the batches are played in-process.
+    """
+
+    def __init__(self, workers: int, rollouts_per_worker: int):
+        self.workers = workers
+        self.rollouts_per_worker = rollouts_per_worker
+        self._pool = None
+        if not multiprocessing.current_process().daemon:
+            self._pool = multiprocessing.Pool(workers)
+        # stop the workers once the owning agent is garbage collected
+        self._finalizer = weakref.finalize(self, _terminate, self._pool)
+
+    @property
+    def batch_size(self) -> int:
+        return self.workers * self.rollouts_per_worker
+
+    def run(self, board: Board, colour: Colour, rollout_policy: str) -> tuple[int, int]:
+        """Plays batch_size rollouts from board with colour to move and
+        returns the number won by red and by blue.
+        """
+
+        packed = board.bits.to_bytes()
+        tasks = [
+            (
+                board.size, packed, colour, self.rollouts_per_worker,
+                rollout_policy, random.getrandbits(64),
+            )
+            for _ in range(self.workers)
+        ]
+
+        if self._pool is None:
+            results = map(run_rollouts, tasks)
+        else:
+            results = self._pool.map(run_rollouts, tasks)
+        red_wins = blue_wins = 0
+        for red, blue in results:
+            red_wins += red
+            blue_wins += blue
+        return red_wins, blue_wins
+
+    def close(self):
+        self._finalizer()
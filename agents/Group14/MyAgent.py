@@ -29,16 +29,6 @@ class MyAgent(AgentBase):
         self.legal_moves_count = self._board_size * self._board_size
 
 
-    #COPY BOARD THROUGH AGENT, move if it is allowed to copy board through Board
-    def copy_board(self, board: Board) -> Board:
-        new_board = Board(board.size)
-
-        for x in range(board.size):
-            for y in range(board.size):
-                new_board.set_tile_colour(x, y, board.tiles[x][y].colour)
-
-        return new_board
-    
 
 
     def make_move(self, turn: int, board: Board, opp_move: Move | None) -> Move:
@@ -76,14 +66,15 @@ class MyAgent(AgentBase):
     
 
     def MCTS(self,choices,board) -> Move:
-        root = Node(self.copy_board(board),self.colour, choices, move=None,parent=None)
+        root = Node(self.colour, board.bits.empty(), move=None,parent=None)
+        board_state = board.copy()
         for i in range(5000):
             node = root
-            board_state = self.copy_board(board)
+            board.copy_into(board_state)
 
             #SELECTION
             #Check all untried nodes and node is non-terminal
-            while node.untried_moves == [] and node.child_nodes:
+            while not node.has_untried_moves() and node.child_nodes:
                 child = node.best_child()
                 move = child.move
                 board_state.set_tile_colour(move.x, move.y, node.colour)  # Use parent node's colour
@@ -92,13 +83,13 @@ class MyAgent(AgentBase):
         
             #EXPANSION
             #Add an extra child
-            if node.untried_moves:
-                move = random.choice(node.untried_moves)
+            if node.has_untried_moves():
+                move = node.pop_untried_move(board.size)
                 #next_colour = self.opp_colour()
                 next_colour = Colour.BLUE if node.colour == Colour.RED else Colour.RED
                 #print(f"next colour: {next_colour}")
-                board_state.set_tile_colour(move[0], move[1], node.colour)
-                child = node.expand(self.copy_board(board_state), next_colour, move)
+                board_state.set_tile_colour(move.x, move.y, node.colour)
+                child = node.expand(board_state, next_colour, move)
                 node = child
             
 
@@ -1,18 +1,28 @@
 #from random import choice, random
 import random
-from agents.Group14.VirtualBridge import VirtualBridge
+from agents.Group14.LeafParallel import LeafParallelRollouts
+from agents.Group14.Ponder import Ponderer, free_threaded
+from agents.Group14.RootParallel import RootParallelSearch
+from agents.Group14.Rollout import (
+    FILL,
+    batch_fill_rollouts,
+    rollout,
+    rollout_stones,
+    stone_cells,
+)
+from agents.Group14.TimeManager import TimeManager
+from agents.Group14.Transposition import TranspositionSearch
+from agents.Group14.Tree import Tree
+from agents.Group14.TreeParallel import TreeParallelSearch
+from agents.Group14.VirtualBridge import BridgeIndex, VirtualBridge
 from src.AgentBase import AgentBase
 from src.Board import Board
 from src.Colour import Colour
 from src.Move import Move
 from .Node import Node
 import time
+import weakref
 
-HEX_DIRS = [
-    (-1, 0), (1, 0),
-    (0, -1), (0, 1),
-    (-1, 1), (1, -1)
-]
 safe_first_moves = [Move(0, 1), Move(0, 9), Move(10, 1), Move(10, 9)] 
 
 class MyAgentBest(AgentBase):
@@ -24,10 +34,25 @@ class MyAgentBest(AgentBase):
     You must implement the make_move method to make the agent functional.
     You CANNOT modify the AgentBase class, otherwise your agent might not function.
     """
-    _iterations: int = 5000
+    _iterations: int = 1_000_000  # upper bound, the time manager's deadline normally stops the search first
+    _rollout_policy: str = FILL  # see Rollout.ROLLOUT_POLICIES
+    _reuse_tree: bool = True  # keep the subtree of the opponent's reply between turns
+    _tree_storage: str = "node"  # "node" for Node objects, "array" for the array-backed Tree, "transposition" for TranspositionSearch
+    _tt_memory: int = 64 * 2**20  # bytes for the transposition table
+    _workers: int = 1  # more than 1 runs root-parallel searches, _iterations per worker
+    _threads: int = 1  # more than 1 shares one Node tree between threads (node storage)
+    _leaf_workers: int = 1  # more than 1 plays each leaf's rollouts in a worker pool (node storage)
+    _leaf_rollouts: int = 16  # rollouts per leaf worker per iteration
+    _batch_rollouts: int = 0  # more than 0 plays that many fill rollouts per leaf at once with NumPy, without RAVE statistics (node storage, serial search)
+    _rave: float = 300.0  # RAVE equivalence parameter, 0 is plain UCT (node storage, serial search)
+    # keep searching the reused tree while the opponent thinks (node storage). Only on a
+    # free-threaded build: under the GIL the thread would take its time from an opponent in
+    # the same process, as in Game and HexTournament, while their clock runs
+    _ponder: bool = False
+    _ponder_limit: float = 30.0  # seconds, ends pondering if no make_move follows
     _choices: list[Move]
     _board_size: int = 11
-    virtual_bridges: list[VirtualBridge] = []
+    virtual_bridges: BridgeIndex
     
 
     def __init__(self, colour: Colour):
@@ -36,7 +61,28 @@ class MyAgentBest(AgentBase):
             Move(i, j) for i in range(self._board_size) for j in range(self._board_size)
         ]
         self._hexes = self._board_size * self._board_size
-        self.virtual_bridges = []
+        self.virtual_bridges = BridgeIndex()
+        # search tree rooted after our last move and the board it expects
+        self._root: Node | Tree | None = None
+        self._expected_board: Board | None = None
+        self._time = TimeManager()
+        # position statistics kept for the whole game with "transposition" storage
+        self._transpositions: TranspositionSearch | None = None
+        # worker pool kept for the whole game when searching in parallel
+        self._parallel: RootParallelSearch | None = None
+        if self._workers > 1:
+            self._parallel = RootParallelSearch(self._workers)
+        self._tree_parallel: TreeParallelSearch | None = None
+        if self._threads > 1 and self._parallel is None:
+            self._tree_parallel = TreeParallelSearch(self._threads)
+        self._leaf_parallel: LeafParallelRollouts | None = None
+        if self._leaf_workers > 1 and self._parallel is None and self._tree_parallel is None:
+            self._leaf_parallel = LeafParallelRollouts(self._leaf_workers, self._leaf_rollouts)
+        self._ponderer: Ponderer | None = None
+        if self._ponder and free_threaded():
+            self._ponderer = Ponderer(self, self._ponder_limit)
+            # stop the thread once the agent is dropped at the end of the game
+            weakref.finalize(self, self._ponderer.stop)
         
         self.t_copy = 0.0
         self.t_select = 0.0
@@ -44,21 +90,12 @@ class MyAgentBest(AgentBase):
         self.t_sim = 0.0
         self.t_backprop = 0.0
         self.rollouts = 0
+        self.pondered = 0
         self.forced = 0.0
         self.others = 0.0
         self.total = 0.0
 
         
-    #COPY BOARD THROUGH AGENT, move if it is allowed to copy board through Board
-    def copy_board(self, board: Board) -> Board:
-        new_board = Board(board.size)
-
-        for x in range(board.size):
-            for y in range(board.size):
-                new_board.set_tile_colour(x, y, board.tiles[x][y].colour)
-
-        return new_board
-    
     def make_move(self, turn: int, board: Board, opp_move: Move | None) -> Move:
         """The game engine will call this method to request a move from the agent.
         If the agent is to make the first move, opp_move will be None.
@@ -75,6 +112,11 @@ class MyAgentBest(AgentBase):
             Move: The agent's move
         """
         t0 = time.perf_counter()
+        if self._ponderer is not None:
+            # the tree must be left alone before it is re-rooted
+            self.pondered += self._ponderer.stop()
+        self.advance_tree(board, opp_move)
+
         # TURN 1: we move first (opp_move is None by contract)
         if opp_move == None:
             safe_moves = [m for m in safe_first_moves if m in self._choices]
@@ -82,6 +124,10 @@ class MyAgentBest(AgentBase):
             self._choices.remove(move)
             return move
 
+        # the opponent swapped, so the stone our bridges start from is theirs
+        if opp_move is not None and opp_move.is_swap():
+            self.virtual_bridges.clear()
+
         # Case 1: opponent played a normal move
         if opp_move is not None and opp_move.x != -1:
             if opp_move in self._choices:
@@ -116,12 +162,24 @@ class MyAgentBest(AgentBase):
         
         
         #Find best move
+        # search for this move's share of the clock
+        self._time.start_move(len(self._choices))
+        rollouts_before = self.rollouts
         best_move = self.MCTS(self._choices,board)
+        self._time.end_move(self.rollouts - rollouts_before)
         
         #Remove moves made by agent
         self._choices.remove(best_move)
         # update board for bridge detection
         board.set_tile_colour(best_move.x, best_move.y, self.colour)
+        if self._root is not None:
+            self._expected_board = board.copy()
+            if (
+                self._ponderer is not None
+                and isinstance(self._root, Node)
+                and not board.has_ended(self.colour)
+            ):
+                self._ponderer.start(self._root, self._expected_board)
 
         # check bridges using tuple
         self.update_bridges(board, best_move)
@@ -132,6 +190,8 @@ class MyAgentBest(AgentBase):
 
         print("\n=== MCTS PROFILE ===")
         print(f"Rollouts: {self.rollouts}")
+        print(f"This move:  {self._time.rollouts_per_move[-1]} in {self._time.budget:.2f}s budget")
+        print(f"Pondered: {self.pondered}")
         print(f"copy_board: {self.t_copy/self.total:.2%}")
         print(f"selection:  {self.t_select/self.total:.2%}")
         print(f"expansion:  {self.t_expand/self.total:.2%}")
@@ -144,226 +204,265 @@ class MyAgentBest(AgentBase):
         
         # only now convert to Move
         return Move(_x=best_move.x, _y=best_move.y)
+
+    def end_game(self):
+        # the game can end on the opponent's move, with no make_move to
+        # stop the ponder thread
+        if self._ponderer is not None:
+            self.pondered += self._ponderer.stop()
     
 
+    def advance_tree(self, board: Board, opp_move: Move | None):
+        """Re-roots the tree kept from our last search on the opponent's reply,
+        so its statistics carry over. The tree is discarded if the reply was
+        never explored or the board is not the position the tree expects
+        (a swap, or a move we did not choose by search).
+        """
+        root, expected = self._root, self._expected_board
+        self._root = None
+        self._expected_board = None
+
+        if root is None or expected is None or opp_move is None or opp_move.is_swap():
+            return
+
+        expected.set_tile_colour(opp_move.x, opp_move.y, self.opp_colour())
+        if expected != board:
+            return
+
+        if isinstance(root, Tree):
+            self._root = root.advance(opp_move)
+            return
+
+        for child in root.child_nodes:
+            if child.move == opp_move:
+                child.parent = None
+                self._root = child
+                return
+
     def MCTS(self, choices: list[Move], board : Board) -> Move:
-        root = Node(self.copy_board(board),self.colour, choices, move=None,parent=None)
+        if self._parallel is not None:
+            # independent trees per worker, nothing to reuse next turn
+            move = self._parallel.search(
+                board, self.colour, self._iterations, self._rollout_policy,
+                time_limit=self._time.time_left(),
+            )
+            self.rollouts += self._parallel.rollouts
+            return move
+
+        if self._tree_storage == "array":
+            return self.array_MCTS(board)
+
+        if self._tree_storage == "transposition":
+            return self.transposition_MCTS(board)
+
+        if self._tree_parallel is not None:
+            return self.threaded_MCTS(board)
+
+        if self._root is not None:
+            root = self._root
+        else:
+            root = Node(self.colour, board.bits.empty(), move=None,parent=None)
+        self._root = None
+        board_state = board.copy()
         for i in range(self._iterations):
-            self.rollouts += 1
-            node = root
+            if self._time.expired():
+                break
+            self.rollouts += self.rollouts_per_iteration
             t0 = time.perf_counter()
-            board_state = self.copy_board(board)
+            board.copy_into(board_state)
             self.t_copy += time.perf_counter() - t0
             
             #SELECTION
             #Check all untried nodes and node is non-terminal
             t0 = time.perf_counter()
-
-            while node.untried_moves == [] and node.child_nodes:
-                node = node.best_child()
-                move : Move = node.move # type: ignore
-                board_state.set_tile_colour(move.x, move.y, node.colour)
-                
+            node = self.select_leaf(root, board_state)
             self.t_select += time.perf_counter() - t0
 
             #EXPANSION
             #Add an extra child
             t0 = time.perf_counter()
-            if node.untried_moves:
-                move = random.choice(node.untried_moves)
-                next_colour = self.opp_colour()
-                board_state.set_tile_colour(move.x, move.y, node.colour)
-                child = node.expand(self.copy_board(board_state), next_colour, move)
-                node = child
+            node = self.expand_leaf(node, board_state)
             self.t_expand += time.perf_counter() - t0
 
-
             #SIMULATION
             t0 = time.perf_counter()
-
-            rollout_colour = node.colour 
-            rollout_moves = node.untried_moves[:]  # remaining legal moves
-
-            random.shuffle(rollout_moves)
-
-            for legal_move in rollout_moves:
-                board_state.set_tile_colour(legal_move.x, legal_move.y, rollout_colour) #Colour random legal move
-                rollout_colour = self.opp_colour()
-
-                if board_state.has_ended(rollout_colour): #Check if game has ended
-                    break
-            
+            outcome = self.simulate(node, board_state)
             self.t_sim += time.perf_counter() - t0
 
-            t0 = time.perf_counter()
-
             #BACKPROPAGATION
-            winner = board_state.get_winner()
-            node.backpropagation(winner)
+            t0 = time.perf_counter()
+            self.backpropagate(node, outcome)
             self.t_backprop += time.perf_counter() - t0
 
 
         #Return most visited node
         best_child = max(root.child_nodes, key=lambda c: c.visits)
+        if self._reuse_tree:
+            # keep our move's subtree, its children are the opponent's replies
+            best_child.parent = None
+            self._root = best_child
         return best_child.move # type: ignore
             
-    def check_edge_bridges(self, board: Board, our_move: Move):
-        x, y = our_move.x, our_move.y
-        N = self._board_size
-
-        # Determine connection axis
-        # RED connects top/bottom → x axis
-        # BLUE connects left/right → y axis
-        if self.colour == Colour.RED:
-            axis = 0  # x
-        else:
-            axis = 1  # y
-
-        coord = (x, y)[axis]
-
-        # Determine which goal edge we're near
-        if coord == 1:
-            edge_coord = 0
-        elif coord == N - 2:
-            edge_coord = N - 1
-        else:
-            return  # not near a relevant goal edge
-
-        links : list[Move] = []
-
-        # iterate possible bridge links along the other axis
-        for d in (-1, 0, 1):
-            other_coord = (x, y)[1 - axis] + d
-            if 0 <= other_coord < N:
-                pos = (
-                    (edge_coord, other_coord) if axis == 0
-                    else (other_coord, edge_coord)
-                )
-                if board.tiles[pos[0]][pos[1]].colour is None:
-                    links.append(Move(*pos))
-
-        if len(links) == 2:
-            
-            print("  *** EDGE BRIDGE FOUND ***")
-                    
-            print("Between:", (x,y))
-            print("Link = ", links)
-            
-            self.virtual_bridges.append(
-                VirtualBridge(
-                    our_move,
-                    None,          # edge-side endpoint
-                    links[:2]
-                )
+    # One serial iteration, split by phase so MCTS can time each phase and
+    # the Ponderer runs the same search on the reused tree
+
+    @property
+    def rollouts_per_iteration(self) -> int:
+        if self._leaf_parallel is not None:
+            return self._leaf_parallel.batch_size
+        if self._batch_rollouts > 0:
+            return self._batch_rollouts
+        return 1
+
+    def select_leaf(self, root: Node, board_state: Board) -> Node:
+        """Follows best_child from root to a node with untried moves or no
+        children, playing the moves onto board_state.
+        """
+        node = root
+        while not node.has_untried_moves() and node.child_nodes:
+            child = node.best_child(self._rave)
+            move : Move = child.move # type: ignore
+            board_state.set_tile_colour(move.x, move.y, node.colour) # node.colour plays into child
+            node = child
+        return node
+
+    def expand_leaf(self, node: Node, board_state: Board) -> Node:
+        """Plays one untried move of node onto board_state and returns the
+        new child, or node itself if it has no untried moves.
+        """
+        if not node.has_untried_moves():
+            return node
+        move = node.pop_untried_move(board_state.size, by_amaf=self._rave > 0)
+        board_state.set_tile_colour(move.x, move.y, node.colour)
+        return node.expand(board_state, Colour.opposite(node.colour), move)
+
+    def simulate(self, node: Node, board_state: Board) -> tuple[int, int, tuple[int, int] | None]:
+        """Plays rollouts_per_iteration rollouts from board_state with
+        node.colour to move. Returns the red and blue wins, and the final
+        red and blue stones when a single rollout feeds RAVE, else None.
+        """
+        if self._leaf_parallel is not None:
+            # one batch of rollouts from this leaf spread over the workers
+            red_wins, blue_wins = self._leaf_parallel.run(
+                board_state, node.colour, self._rollout_policy
+            )
+            return red_wins, blue_wins, None
+        if self._batch_rollouts > 0:
+            # one bit-sliced batch of fill rollouts from this leaf
+            wins = batch_fill_rollouts(board_state, node.colour, self._batch_rollouts)
+            if node.colour == Colour.RED:
+                return wins, self._batch_rollouts - wins, None
+            return self._batch_rollouts - wins, wins, None
+        if self._rave > 0:
+            # the final stones feed the AMAF statistics
+            winner, red, blue = rollout_stones(self._rollout_policy, board_state, node.colour)
+            return int(winner == Colour.RED), int(winner == Colour.BLUE), (red, blue)
+        winner = rollout(self._rollout_policy, board_state, node.colour)
+        return int(winner == Colour.RED), int(winner == Colour.BLUE), None
+
+    def backpropagate(self, node: Node, outcome: tuple[int, int, tuple[int, int] | None]):
+        """Backs up an outcome returned by simulate from node to the root."""
+        red_wins, blue_wins, stones = outcome
+        if red_wins:
+            node.backpropagation(Colour.RED, red_wins)
+        if blue_wins:
+            node.backpropagation(Colour.BLUE, blue_wins)
+        if stones is not None:
+            winner = Colour.RED if red_wins else Colour.BLUE
+            red, blue = stones
+            node.amaf_update(
+                winner, stone_cells(red, self._hexes), stone_cells(blue, self._hexes)
             )
 
-    
-    def check_bridges(self, board: Board, our_move: Move):
-
-        print("OUR MOVE:", our_move)
-        x, y = our_move.x, our_move.y
-        colour = self.colour
-
-        if board.tiles[x][y].colour != colour:
-            return
-        
-        nbrs_xy = set(self.neighbours(x, y))
-
-        dirs = HEX_DIRS
-
-        for i in range(len(dirs)):
-            
-            dx1, dy1 = dirs[i]
-            
-            for j in range(i + 1, len(dirs)):
-                
-                dx2, dy2 = dirs[j]
-                
-                if (dx1, dy1) == (dx2, dy2):
-                    continue
-
-                tx = x + dx1 + dx2
-                ty = y + dy1 + dy2
+    def threaded_MCTS(self, board: Board) -> Move:
+        root = self._root
+        if root is None:
+            root = Node(self.colour, board.bits.empty(), move=None,parent=None)
+        self._root = None
 
+        t0 = time.perf_counter()
+        self.rollouts += self._tree_parallel.search( # type: ignore
+            root, board, self._iterations, self._rollout_policy, self._time.deadline
+        )
+        self.t_sim += time.perf_counter() - t0
 
-                if not (0 <= tx < self._board_size and 0 <= ty < self._board_size):
-                    continue
+        best_child = max(root.child_nodes, key=lambda c: c.visits)
+        if self._reuse_tree:
+            best_child.parent = None
+            self._root = best_child
+        return best_child.move # type: ignore
 
+    def transposition_MCTS(self, board: Board) -> Move:
+        if self._transpositions is None:
+            self._transpositions = TranspositionSearch(self._tt_memory)
 
-                if board.tiles[tx][ty].colour != colour:
-                    continue
-                
-                if tx == x and ty == y:
-                    continue
-                
-                # reject adjacent endpoints
-                if (tx, ty) in nbrs_xy:
-                    continue
+        t0 = time.perf_counter()
+        self.rollouts += self._transpositions.search(
+            board, self.colour, self._iterations, self._rollout_policy, self._time.deadline
+        )
+        self.t_sim += time.perf_counter() - t0
+        return self._transpositions.best_move(board, self.colour)
 
+    def array_MCTS(self, board: Board) -> Move:
+        tree = self._root if self._root is not None else Tree(board.size, self.colour)
+        self._root = None
 
-                common : list[Move] = []
-                nbrs_tx_ty = set(self.neighbours(tx, ty))
+        t0 = time.perf_counter()
+        self.rollouts += tree.search(
+            board, self._iterations, self._rollout_policy, self._time.deadline
+        )
+        self.t_sim += time.perf_counter() - t0
 
-                for nx, ny in nbrs_xy:
+        best_move = tree.best_move()
+        if self._reuse_tree:
+            self._root = tree.advance(best_move)
+        return best_move
 
-                    if (nx, ny) in nbrs_tx_ty:
+    def check_edge_bridges(self, board: Board, our_move: Move):
+        # RED connects top/bottom, BLUE connects left/right
+        for bridge in VirtualBridge.find_edge(board, our_move, self.colour):
+            if not self.virtual_bridges.add(bridge):
+                continue
 
-                        if board.tiles[nx][ny].colour is None:
-                            common.append(Move(nx, ny))
+            print("  *** EDGE BRIDGE FOUND ***")
 
+            print("Between:", (our_move.x, our_move.y))
+            print("Link = ", bridge.links)
 
-                if len(common) == 2:
-                    print("  *** BRIDGE FOUND ***")
-                    
-                    print("Between:", (x,y), (tx,ty))
-                    print("Link = ", common)
 
-                    bridge = VirtualBridge(Move(x, y), Move(tx, ty), common)
-                    self.virtual_bridges.append(bridge)
+    def check_bridges(self, board: Board, our_move: Move):
 
+        print("OUR MOVE:", our_move)
+        for bridge in VirtualBridge.find(board, our_move, self.colour):
+            if not self.virtual_bridges.add(bridge):
+                continue
+            print("  *** BRIDGE FOUND ***")
 
-    def neighbours(self, x : int, y : int):
-        for dx, dy in HEX_DIRS:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self._board_size and 0 <= ny < self._board_size:
-                yield nx, ny
+            end1, end2 = bridge.ends
+            print("Between:", (end1.x, end1.y), (end2.x, end2.y))
+            print("Link = ", bridge.links)
 
     def check_bridge_invasion(self, opp_move : Move) -> Move | None:
 
-        ox, oy = opp_move.x, opp_move.y
-        
         print("Virtual bridge length right after opp_move:", len(self.virtual_bridges))
-        
-        RETALIATION_MOVE = None
-        
-        for bridge in self.virtual_bridges[:]:  # copy to allow removal
-            
-            
-            l1 = bridge.links[0]
-            l2 = bridge.links[1]
-            
-            if ox == l1.x and oy == l1.y:
-                self.virtual_bridges.remove(bridge)                
-                if not RETALIATION_MOVE:
-                    RETALIATION_MOVE = l2
-
-            elif ox == l2.x and oy == l2.y:
-                self.virtual_bridges.remove(bridge)
-                if not RETALIATION_MOVE:
-                    RETALIATION_MOVE = l1
-
-        return RETALIATION_MOVE
-                    
-    def remove_broken_bridges(self, move : Move):
-        _ = self.check_bridge_invasion(move) 
 
-            
+        # every bridge through the intruded cell is dropped, the first one
+        # found is saved by taking its other carrier
+        for bridge in self.virtual_bridges.fill(opp_move):
+            l1, l2 = bridge.links
+            return l2 if opp_move == l1 else l1
+        return None
+
+    def remove_broken_bridges(self, move : Move):
+        # our own stone on a carrier makes that bridge solid
+        self.virtual_bridges.fill(move)
 
 
     def apply_terminal_protocol(self, board: Board, choices: list[Move]) -> Move | None:
         # 1) Immediate winning move
+        b = board.copy()
         for move in choices:
-            b = self.copy_board(board)
+            board.copy_into(b)
             b.set_tile_colour(move.x, move.y, self.colour)
             if b.has_ended(self.colour):
                 return move
@@ -371,7 +470,7 @@ class MyAgentBest(AgentBase):
         # 2) Immediate blocking move
         opp = self.opp_colour()
         for move in choices:
-            b = self.copy_board(board)
+            board.copy_into(b)
             b.set_tile_colour(move.x, move.y, opp)
             if b.has_ended(opp):
                 return move
@@ -383,6 +482,8 @@ class MyAgentBest(AgentBase):
         terminal_move = self.apply_terminal_protocol(board, choices)
         if terminal_move is not None:
             self._choices.remove(terminal_move)
+            # bridges the opponent's stone landed on are gone either way
+            self.virtual_bridges.fill(opp_move)
             print("FOUND FORCED WIN...MOVING TO TAKE/BLOCK...")
             return Move(terminal_move.x, terminal_move.y)
 
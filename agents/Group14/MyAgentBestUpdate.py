@@ -1,6 +1,7 @@
 #from random import choice, random
 import random
-from agents.Group14.VirtualBridge import VirtualBridge
+from agents.Group14.Rollout import FILL, rollout
+from agents.Group14.VirtualBridge import BridgeIndex, VirtualBridge
 from src.AgentBase import AgentBase
 from src.Board import Board
 from src.Colour import Colour
@@ -8,11 +9,6 @@ from src.Move import Move
 from .Node import Node
 import time
 
-HEX_DIRS = [
-    (-1, 0), (1, 0),
-    (0, -1), (0, 1),
-    (-1, 1), (1, -1)
-]
 safe_first_moves = [Move(0, 1), Move(0, 9), Move(10, 1), Move(10, 9)] 
 
 class MyAgentBestUpdate(AgentBase):
@@ -25,9 +21,10 @@ class MyAgentBestUpdate(AgentBase):
     You CANNOT modify the AgentBase class, otherwise your agent might not function.
     """
     _iterations: int = 5000
+    _rollout_policy: str = FILL  # see Rollout.ROLLOUT_POLICIES
     _choices: list[Move]
     _board_size: int = 11
-    virtual_bridges: list[VirtualBridge] = []
+    virtual_bridges: BridgeIndex
     
 
     def __init__(self, colour: Colour):
@@ -36,7 +33,7 @@ class MyAgentBestUpdate(AgentBase):
             Move(i, j) for i in range(self._board_size) for j in range(self._board_size)
         ]
         self._hexes = self._board_size * self._board_size
-        self.virtual_bridges = []
+        self.virtual_bridges = BridgeIndex()
         
         self.t_copy = 0.0
         self.t_select = 0.0
@@ -49,16 +46,6 @@ class MyAgentBestUpdate(AgentBase):
         self.total = 0.0
 
         
-    #COPY BOARD THROUGH AGENT, move if it is allowed to copy board through Board
-    def copy_board(self, board: Board) -> Board:
-        new_board = Board(board.size)
-
-        for x in range(board.size):
-            for y in range(board.size):
-                new_board.set_tile_colour(x, y, board.tiles[x][y].colour)
-
-        return new_board
-    
     def make_move(self, turn: int, board: Board, opp_move: Move | None) -> Move:
         """The game engine will call this method to request a move from the agent.
         If the agent is to make the first move, opp_move will be None.
@@ -82,6 +69,10 @@ class MyAgentBestUpdate(AgentBase):
             self._choices.remove(move)
             return move
 
+        # the opponent swapped, so the stone our bridges start from is theirs
+        if opp_move is not None and opp_move.is_swap():
+            self.virtual_bridges.clear()
+
         # Case 1: opponent played a normal move
         if opp_move is not None and opp_move.x != -1:
             if opp_move in self._choices:
@@ -147,18 +138,19 @@ class MyAgentBestUpdate(AgentBase):
     
 
     def MCTS(self,choices,board) -> Move:
-        root = Node(self.copy_board(board),self.colour, choices, move=None,parent=None)
-        for i in range(5000):
+        root = Node(self.colour, board.bits.empty(), move=None,parent=None)
+        board_state = board.copy()
+        for i in range(self._iterations):
             node = root
             t0 = time.perf_counter()
-            board_state = self.copy_board(board)
+            board.copy_into(board_state)
             self.t_copy += time.perf_counter() - t0
 
 
             #SELECTION
             #Check all untried nodes and node is non-terminal
             t0 = time.perf_counter()
-            while node.untried_moves == [] and node.child_nodes:
+            while not node.has_untried_moves() and node.child_nodes:
                 child = node.best_child()
                 move = child.move
                 board_state.set_tile_colour(move.x, move.y, node.colour)  # type: ignore # Use parent node's colour
@@ -169,15 +161,15 @@ class MyAgentBestUpdate(AgentBase):
             #EXPANSION
             #Add an extra child
             t0 = time.perf_counter()    
-            if node.untried_moves:
-                move = random.choice(node.untried_moves)
+            if node.has_untried_moves():
+                move = node.pop_untried_move(board.size)
                 #next_colour = self.opp_colour()
                 next_colour = Colour.BLUE if node.colour == Colour.RED else Colour.RED
                 #print(f"next colour: {next_colour}")
-                board_state.set_tile_colour(move.x, move.x, node.colour)
+                board_state.set_tile_colour(move.x, move.y, node.colour)
                 
                 t0 = time.perf_counter()
-                child = node.expand(self.copy_board(board_state), next_colour, move)
+                child = node.expand(board_state, next_colour, move)
                 self.t_copy += time.perf_counter() - t0
 
                 node = child
@@ -186,31 +178,12 @@ class MyAgentBestUpdate(AgentBase):
 
             #SIMULATION
             t0 = time.perf_counter()
-            rollout_colour = node.colour             
-             # --- FIX: Generate all possible moves, remove those already played ---
-            all_possible_moves = [Move(x, y) for x in range(board.size) for y in range(board.size)]
-            played_moves = [
-                Move(x, y)
-                for x in range(board.size)
-                for y in range(board.size)
-                if board_state.tiles[x][y].colour != None
-            ]
-            rollout_moves = [move for move in all_possible_moves if move not in played_moves]
-
-            random.shuffle(rollout_moves)
-            for legal_move in rollout_moves:
-                board_state.set_tile_colour(legal_move.x, legal_move.y, rollout_colour) #Colour random legal move
-
-                rollout_colour = Colour.RED if rollout_colour == Colour.BLUE else Colour.BLUE
+            winner = rollout(self._rollout_policy, board_state, node.colour)
             self.t_sim += time.perf_counter() - t0    
                
 
             #BACKPROPAGATION
-            # has_ended updates the board_state.winner in the method so they need to be called
-            # Could be more efficient
             t0 = time.perf_counter()
-            
-            winner = board_state.get_winner()
 
             node.backpropagation(winner)
             
@@ -220,162 +193,50 @@ class MyAgentBestUpdate(AgentBase):
         return best_child.move # type: ignore
             
     def check_edge_bridges(self, board: Board, our_move: Move):
-        x, y = our_move.x, our_move.y
-        N = self._board_size
-
-        # Determine connection axis
-        # RED connects top/bottom → x axis
-        # BLUE connects left/right → y axis
-        if self.colour == Colour.RED:
-            axis = 0  # x
-        else:
-            axis = 1  # y
-
-        coord = (x, y)[axis]
-
-        # Determine which goal edge we're near
-        if coord == 1:
-            edge_coord = 0
-        elif coord == N - 2:
-            edge_coord = N - 1
-        else:
-            return  # not near a relevant goal edge
-
-        links : list[Move] = []
-
-        # iterate possible bridge links along the other axis
-        for d in (-1, 0, 1):
-            other_coord = (x, y)[1 - axis] + d
-            if 0 <= other_coord < N:
-                pos = (
-                    (edge_coord, other_coord) if axis == 0
-                    else (other_coord, edge_coord)
-                )
-                if board.tiles[pos[0]][pos[1]].colour is None:
-                    links.append(Move(*pos))
+        # RED connects top/bottom, BLUE connects left/right
+        for bridge in VirtualBridge.find_edge(board, our_move, self.colour):
+            if not self.virtual_bridges.add(bridge):
+                continue
 
-        if len(links) == 2:
-            
             print("  *** EDGE BRIDGE FOUND ***")
-                    
-            print("Between:", (x,y))
-            print("Link = ", links)
-            
-            self.virtual_bridges.append(
-                VirtualBridge(
-                    our_move,
-                    None,          # edge-side endpoint
-                    links[:2]
-                )
-            )
-
-    
-    def check_bridges(self, board: Board, our_move: Move):
-
-        print("OUR MOVE:", our_move)
-        x, y = our_move.x, our_move.y
-        colour = self.colour
-
-        if board.tiles[x][y].colour != colour:
-            return
-        
-        nbrs_xy = set(self.neighbours(x, y))
-
-        dirs = HEX_DIRS
-
-        for i in range(len(dirs)):
-            
-            dx1, dy1 = dirs[i]
-            
-            for j in range(i + 1, len(dirs)):
-                
-                dx2, dy2 = dirs[j]
-                
-                if (dx1, dy1) == (dx2, dy2):
-                    continue
-
-                tx = x + dx1 + dx2
-                ty = y + dy1 + dy2
-
 
-                if not (0 <= tx < self._board_size and 0 <= ty < self._board_size):
-                    continue
+            print("Between:", (our_move.x, our_move.y))
+            print("Link = ", bridge.links)
 
 
-                if board.tiles[tx][ty].colour != colour:
-                    continue
-                
-                if tx == x and ty == y:
-                    continue
-                
-                # reject adjacent endpoints
-                if (tx, ty) in nbrs_xy:
-                    continue
-
-
-                common : list[Move] = []
-                nbrs_tx_ty = set(self.neighbours(tx, ty))
-
-                for nx, ny in nbrs_xy:
-
-                    if (nx, ny) in nbrs_tx_ty:
-
-                        if board.tiles[nx][ny].colour is None:
-                            common.append(Move(nx, ny))
-
-
-                if len(common) == 2:
-                    print("  *** BRIDGE FOUND ***")
-                    
-                    print("Between:", (x,y), (tx,ty))
-                    print("Link = ", common)
-
-                    bridge = VirtualBridge(Move(x, y), Move(tx, ty), common)
-                    self.virtual_bridges.append(bridge)
+    def check_bridges(self, board: Board, our_move: Move):
 
+        print("OUR MOVE:", our_move)
+        for bridge in VirtualBridge.find(board, our_move, self.colour):
+            if not self.virtual_bridges.add(bridge):
+                continue
+            print("  *** BRIDGE FOUND ***")
 
-    def neighbours(self, x : int, y : int):
-        for dx, dy in HEX_DIRS:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self._board_size and 0 <= ny < self._board_size:
-                yield nx, ny
+            end1, end2 = bridge.ends
+            print("Between:", (end1.x, end1.y), (end2.x, end2.y))
+            print("Link = ", bridge.links)
 
     def check_bridge_invasion(self, opp_move : Move) -> Move | None:
 
-        ox, oy = opp_move.x, opp_move.y
-        
         print("Virtual bridge length right after opp_move:", len(self.virtual_bridges))
-        
-        RETALIATION_MOVE = None
-        
-        for bridge in self.virtual_bridges[:]:  # copy to allow removal
-            
-            
-            l1 = bridge.links[0]
-            l2 = bridge.links[1]
-            
-            if ox == l1.x and oy == l1.y:
-                self.virtual_bridges.remove(bridge)                
-                if not RETALIATION_MOVE:
-                    RETALIATION_MOVE = l2
-
-            elif ox == l2.x and oy == l2.y:
-                self.virtual_bridges.remove(bridge)
-                if not RETALIATION_MOVE:
-                    RETALIATION_MOVE = l1
-
-        return RETALIATION_MOVE
-                    
-    def remove_broken_bridges(self, move : Move):
-        _ = self.check_bridge_invasion(move) 
 
-            
+        # every bridge through the intruded cell is dropped, the first one
+        # found is saved by taking its other carrier
+        for bridge in self.virtual_bridges.fill(opp_move):
+            l1, l2 = bridge.links
+            return l2 if opp_move == l1 else l1
+        return None
+
+    def remove_broken_bridges(self, move : Move):
+        # our own stone on a carrier makes that bridge solid
+        self.virtual_bridges.fill(move)
 
 
     def apply_terminal_protocol(self, board: Board, choices: list[Move]) -> Move | None:
         # 1) Immediate winning move
+        b = board.copy()
         for move in choices:
-            b = self.copy_board(board)
+            board.copy_into(b)
             b.set_tile_colour(move.x, move.y, self.colour)
             if b.has_ended(self.colour):
                 return move
@@ -383,7 +244,7 @@ class MyAgentBestUpdate(AgentBase):
         # 2) Immediate blocking move
         opp = self.opp_colour()
         for move in choices:
-            b = self.copy_board(board)
+            board.copy_into(b)
             b.set_tile_colour(move.x, move.y, opp)
             if b.has_ended(opp):
                 return move
@@ -395,6 +256,8 @@ class MyAgentBestUpdate(AgentBase):
         terminal_move = self.apply_terminal_protocol(board, choices)
         if terminal_move is not None:
             self._choices.remove(terminal_move)
+            # bridges the opponent's stone landed on are gone either way
+            self.virtual_bridges.fill(opp_move)
             print("FOUND FORCED WIN...MOVING TO TAKE/BLOCK...")
             return Move(terminal_move.x, terminal_move.y)
 
@@ -1,5 +1,7 @@
 #from random import choice, random
 import random
+from agents.Group14.Rollout import FILL, rollout
+from agents.Group14.TimeManager import TimeManager
 from src.AgentBase import AgentBase
 from src.Board import Board
 from src.Colour import Colour
@@ -16,7 +18,8 @@ class MyAgentReroot(AgentBase):
     You must implement the make_move method to make the agent functional.
     You CANNOT modify the AgentBase class, otherwise your agent might not function.
     """
-    _iterations: int = 300
+    _iterations: int = 1_000_000  # upper bound, the time manager's deadline normally stops the search first
+    _rollout_policy: str = FILL  # see Rollout.ROLLOUT_POLICIES
     _choices: list[Move]
     _board_size: int = 11
     virtual_bridges = []
@@ -37,25 +40,17 @@ class MyAgentReroot(AgentBase):
     def __init__(self, colour: Colour):
         super().__init__(colour)
         self._choices = [
-            (i, j) for i in range(self._board_size) for j in range(self._board_size)
+            Move(i, j) for i in range(self._board_size) for j in range(self._board_size)
         ]
         self._hexes = self._board_size * self._board_size
         self._root = None
+        self._time = TimeManager()
+        self._rollouts = 0 # rollouts run by the last search
 
         
         
 
 
-    #COPY BOARD THROUGH AGENT, move if it is allowed to copy board through Board
-    def copy_board(self, board: Board) -> Board:
-        new_board = Board(board.size)
-
-        for x in range(board.size):
-            for y in range(board.size):
-                new_board.set_tile_colour(x, y, board.tiles[x][y].colour)
-
-        return new_board
-    
 
 
     def make_move(self, turn: int, board: Board, opp_move: Move | None) -> Move:
@@ -82,45 +77,15 @@ class MyAgentReroot(AgentBase):
 
         #Remove moves made by other player
         if opp_move is not None:
-            coord = opp_move._x, opp_move._y 
-            if coord in self._choices:
-                self._choices.remove(coord)
-
-
-        empty_ratio = len(self._choices) / (self._hexes)
-        if turn == 1:
-            self._iterations = int(60000 / 4)
-
-        elif turn <= 4:
-            self._iterations = int(50000 / 4)
-
-        elif turn <= 6:
-            self._iterations = int(35000 / 4)
-
-        elif turn <= 8:
-            self._iterations = int(22500 / 4)
-
-        elif turn <= 10:
-            self._iterations = int(15000 / 4)
+            if opp_move in self._choices:
+                self._choices.remove(opp_move)
 
-        else:
 
-            if empty_ratio > 0.5:
-                self._iterations = int(10000 / 4)
-            elif empty_ratio > 0.35:
-                self._iterations = int(6000 / 4)
-            else:
-                self._iterations = int(4000 / 4)
-        
-        self._iterations = int(self._iterations/2)        
         
         # Advance tree with opponent move (re-rooting)
         if opp_move is not None and self._root is not None:
-            opp_coord = (opp_move._x, opp_move._y)
-
             for child in self._root.child_nodes:
-                print((child.move.__str__(), opp_coord) )
-                if child.move == opp_coord:
+                if child.move == opp_move:
                     print("REROOTING...")
                     self._root = child
                     self._root.parent = None
@@ -130,12 +95,14 @@ class MyAgentReroot(AgentBase):
                 self._root = None
 
         
-        #Find best move
+        #Find best move within this move's share of the clock
+        self._time.start_move(len(self._choices))
         best_move = self.MCTS(self._choices,board)
+        self._time.end_move(self._rollouts)
+        print(f"Rollouts: {self._rollouts} in {self._time.budget:.2f}s budget")
         
         #Remove moves made by agent
         self._choices.remove(best_move)
-        best_move = Move(_x = best_move[0], _y = best_move[1])
         return best_move
     
 
@@ -144,49 +111,43 @@ class MyAgentReroot(AgentBase):
         if self._root is None:
             print("Creating new root...")
             self._root = Node(
-                self.copy_board(board),
                 self.colour,
-                choices,
+                board.bits.empty(),
                 move=None,
                 parent=None
             )
 
         root = self._root
+        board_state = board.copy()
+        self._rollouts = 0
         for i in range(self._iterations):
+            if self._time.expired():
+                break
+            self._rollouts += 1
             node = root
-            board_state = self.copy_board(board)
+            board.copy_into(board_state)
 
             #SELECTION
             #Check all untried nodes and node is non-terminal
-            while node.untried_moves == [] and node.child_nodes:
-                node = node.best_child()
-                move = node.move
-                board_state.set_tile_colour(move[0], move[1], node.colour)
+            while not node.has_untried_moves() and node.child_nodes:
+                child = node.best_child()
+                move = child.move
+                board_state.set_tile_colour(move.x, move.y, node.colour)
+                node = child
 
             #EXPANSION
             #Add an extra child
-            if node.untried_moves:
-                move = random.choice(node.untried_moves)
-                next_colour = self.opp_colour()
-                board_state.set_tile_colour(move[0], move[1], node.colour)
-                child = node.expand(self.copy_board(board_state), next_colour, move)
+            if node.has_untried_moves():
+                move = node.pop_untried_move(board.size)
+                next_colour = Colour.opposite(node.colour)
+                board_state.set_tile_colour(move.x, move.y, node.colour)
+                child = node.expand(board_state, next_colour, move)
                 node = child
 
             #SIMULATION
-            rollout_colour = node.colour 
-            rollout_moves = node.untried_moves[:]  # remaining legal moves
-
-            random.shuffle(rollout_moves)
-
-            for legal_move in rollout_moves:
-                board_state.set_tile_colour(legal_move[0], legal_move[1], rollout_colour) #Colour random legal move
-                rollout_colour = self.opp_colour()
-
-                if board_state.has_ended(rollout_colour): #Check if game has ended
-                    break
+            winner = rollout(self._rollout_policy, board_state, node.colour)
 
             #BACKPROPAGATION
-            winner = board_state.get_winner()
             node.backpropagation(winner)
 
         if not root.child_nodes:
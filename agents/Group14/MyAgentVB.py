@@ -1,5 +1,6 @@
 #from random import choice, random
 import random
+from agents.Group14.Rollout import FILL, rollout
 from src.AgentBase import AgentBase
 from src.Board import Board
 from src.Colour import Colour
@@ -7,11 +8,6 @@ from src.Move import Move
 #from . import Node
 from .Node import Node
 
-HEX_DIRS = [
-    (-1, 0), (1, 0),
-    (0, -1), (0, 1),
-    (-1, 1), (1, -1)
-]
 safe_first_moves = [(0, 1), (0, 9), (10, 1), (10, 9)] 
 
 class MyAgentVB(AgentBase):
@@ -24,6 +20,7 @@ class MyAgentVB(AgentBase):
     You CANNOT modify the AgentBase class, otherwise your agent might not function.
     """
     _iterations: int = 1000
+    _rollout_policy: str = FILL  # see Rollout.ROLLOUT_POLICIES
     _choices: list[Move]
     _board_size: int = 11
     virtual_bridges = []
@@ -35,16 +32,6 @@ class MyAgentVB(AgentBase):
         ]
         self._hexes = self._board_size * self._board_size
 
-    #COPY BOARD THROUGH AGENT, move if it is allowed to copy board through Board
-    def copy_board(self, board: Board) -> Board:
-        new_board = Board(board.size)
-
-        for x in range(board.size):
-            for y in range(board.size):
-                new_board.set_tile_colour(x, y, board.tiles[x][y].colour)
-
-        return new_board
-    
     def check_virtual_bridges(self, board: Board, move):
 
         self.virtual_bridges = [
@@ -57,29 +44,16 @@ class MyAgentVB(AgentBase):
         if board.tiles[x][y].colour != colour:
             return
 
-        for dx, dy in HEX_DIRS:
-            ox, oy = x + dx, y + dy
-            if not (0 <= ox < self._board_size and 0 <= oy < self._board_size):
-                continue
-
-            # look past one hex
-            tx, ty = ox + dx, oy + dy
-            if not (0 <= tx < self._board_size and 0 <= ty < self._board_size):
-                continue
-
+        size = board.size
+        for partner, carrier, other in board.bits.geometry.bridges[x * size + y]:
+            tx, ty = divmod(partner, size)
             if board.tiles[tx][ty].colour != colour:
                 continue
 
             # x,y and tx,ty are same colour and not adjacent
-            # find common neighbours
-            common = []
-
-            for nx, ny in self.neighbours(x, y):
-                if (nx, ny) in self.neighbours(tx, ty):
-                    if board.tiles[nx][ny].colour is None:
-                        common.append((nx, ny))
-
-            if len(common) == 2:
+            # the two carrier cells are their common neighbours
+            common = [divmod(carrier, size), divmod(other, size)]
+            if all(board.tiles[nx][ny].colour is None for nx, ny in common):
                 bridge = {
                     "ends": ((x, y), (tx, ty)),
                     "links": tuple(common)
@@ -90,12 +64,6 @@ class MyAgentVB(AgentBase):
                     self.virtual_bridges.append(bridge)
 
 
-    def neighbours(self, x, y):
-        for dx, dy in HEX_DIRS:
-            nx, ny = x + dx, y + dy
-            if 0 <= nx < self._board_size and 0 <= ny < self._board_size:
-                yield nx, ny
-
     def check_bridge_invasion(self, opp_move):
 
         
@@ -181,46 +149,38 @@ class MyAgentVB(AgentBase):
     
 
     def MCTS(self,choices,board):
-        root = Node(self.copy_board(board),self.colour,choices, move=None,parent=None)
+        root = Node(self.colour,board.bits.empty(), move=None,parent=None)
+        board_state = board.copy()
         for i in range(self._iterations):
             node = root
-            board_state = self.copy_board(board)
+            board.copy_into(board_state)
 
             #SELECTION
             #Check all untried nodes and node is non-terminal
-            while node.untried_moves == [] and node.child_nodes:
-                node = node.best_child()
-                move = node.move
-                board_state.set_tile_colour(move[0], move[1], node.colour)
+            while not node.has_untried_moves() and node.child_nodes:
+                child = node.best_child()
+                move = child.move
+                board_state.set_tile_colour(move.x, move.y, node.colour)
+                node = child
 
             #EXPANSION
             #Add an extra child
-            if node.untried_moves:
-                move = random.choice(node.untried_moves)
-                next_colour = self.opp_colour()
-                board_state.set_tile_colour(move[0], move[1], node.colour)
-                child = node.expand(self.copy_board(board_state), next_colour, move)
+            if node.has_untried_moves():
+                move = node.pop_untried_move(board.size)
+                next_colour = Colour.opposite(node.colour)
+                board_state.set_tile_colour(move.x, move.y, node.colour)
+                child = node.expand(board_state, next_colour, move)
                 node = child
 
             #SIMULATION
-            rollout_colour = node.colour 
-            rollout_moves = node.untried_moves[:]  # remaining legal moves
-
-            random.shuffle(rollout_moves)
-
-            for legal_move in rollout_moves:
-                board_state.set_tile_colour(legal_move[0], legal_move[1], rollout_colour) #Colour random legal move
-                rollout_colour = self.opp_colour()
-
-                if board_state.has_ended(rollout_colour): #Check if game has ended
-                    break
+            winner = rollout(self._rollout_policy, board_state, node.colour)
 
             #BACKPROPAGATION
-            winner = board_state.get_winner()
             node.backpropagation(winner)
 
         #Return most visited node
         best_child = max(root.child_nodes, key=lambda c: c.visits)
-        return best_child.move
+        # choices are kept as (x, y) tuples
+        return best_child.move.x, best_child.move.y
             
     
\ No newline at end of file
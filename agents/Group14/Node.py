@@ -1,75 +1,175 @@
 import math
 import random
+from array import array
+
+import numpy as np
+
 from src.AgentBase import AgentBase
-from src.Board import Board
 from src.Colour import Colour
+from src.Geometry import Geometry
 from src.Move import Move
 
 
+# UCB1 exploration constant, also used by Tree and TranspositionSearch
+EXPLORATION = 1.41
+
+# tie-breaking noise for pop_untried_move(by_amaf=True)
+_noise = np.random.default_rng()
+
+
 class Node:
 
-    def __init__(self, board, colour,legal_moves,move = None,parent=None):
+    def __init__(self, colour,untried,move = None,parent=None):
         self.parent:Node|None = parent  #parent node(none = root)             
         self.visits:int = 0 #times node has been visited
         self.child_nodes:list[Node] = [] #child nodes
         self.wins:int = 0 #amount of wins
-        self.board:Board = board #copy of board
         self.move:Move|None = move #move prior to node
         self.colour:Colour = colour #who made the move
-        self.untried_moves : list[Move] = legal_moves[:]
+        # cells not expanded yet. Starts as the empty-cell mask of the
+        # position and only becomes a list of cell indices when the first
+        # move is popped, so leaves that are never expanded stay one int
+        self._untried:int|list[int] = untried
+        # visits and wins of child_nodes[i] at index i, kept alongside the
+        # children's own counters so best_child can score them all at once.
+        # Allocated on the first expansion, most nodes are never expanded
+        self._child_visits:array|None = None
+        self._child_wins:array|None = None
+        self._index:int = 0 #position in parent.child_nodes
+        # RAVE: cell of each child, and all-moves-as-first visits and wins
+        # per cell for moves by this node's colour anywhere later in a
+        # playout through this node. The AMAF arrays are only allocated by
+        # amaf_update, once the node has children
+        self._child_cells:array|None = None
+        self._amaf_visits:np.ndarray|None = None
+        self._amaf_wins:np.ndarray|None = None
         
 
+    def has_untried_moves(self) -> bool:
+        return bool(self._untried)
+
+    def pop_untried_move(self, board_size: int, by_amaf: bool = False) -> Move:
+        """Removes and returns a random untried move in O(1) by swapping it
+        with the last entry. With by_amaf, once the node has AMAF statistics
+        the untried move with the best AMAF win rate is taken instead.
+        """
+        untried = self._untried
+        if isinstance(untried, int):
+            cells = []
+            while untried:
+                low = untried & -untried
+                cells.append(low.bit_length() - 1)
+                untried ^= low
+            untried = self._untried = cells
+
+        if by_amaf and self._amaf_visits is not None:
+            cells = np.array(untried)
+            # prior of half a win, noise breaks ties between unseen cells
+            scores = (self._amaf_wins[cells] + 0.5) / (self._amaf_visits[cells] + 1) # type: ignore
+            i = int((scores + _noise.random(len(cells)) * 1e-6).argmax())
+        else:
+            i = random.randrange(len(untried))
+        untried[i], untried[-1] = untried[-1], untried[i]
+        return Geometry.of(board_size).moves[untried.pop()]
+
     def ucb1(self, child: "Node"):
         if child.visits == 0:
             return float("inf")
-        #TWEAK 1.41
-        return (child.wins / child.visits) + 1.41 * math.sqrt(
+        #TWEAK EXPLORATION
+        return (child.wins / child.visits) + EXPLORATION * math.sqrt(
             math.log(self.visits) / child.visits
         )
 
-    def best_child(self):
+    def best_child(self, rave: float = 0.0):
+        """Picks a random unvisited child, or else the child with the best
+        UCB1 score. Scores are computed over the child stat arrays in one
+        NumPy expression instead of one ucb1 call per child.
 
-        unvisited = [child for child in self.child_nodes if child.visits == 0]
-        if unvisited:
-            return random.choice(unvisited)
+        rave > 0 blends each child's AMAF win rate into its mean with
+        weight beta = sqrt(rave / (3 * visits + rave)), so AMAF dominates
+        while a child has few visits of its own and fades out after about
+        rave visits.
+        """
+        count = len(self.child_nodes)
+        visits = np.frombuffer(self._child_visits, dtype=np.float64, count=count) # type: ignore
+        unvisited = np.flatnonzero(visits == 0)
+        if len(unvisited):
+            return self.child_nodes[random.choice(unvisited.tolist())]
 
-        candidates = self.child_nodes[:]
-        return max(candidates, key=self.ucb1)
+        wins = np.frombuffer(self._child_wins, dtype=np.float64, count=count) # type: ignore
+        #TWEAK EXPLORATION
+        means = wins / visits
+        if rave > 0 and self._amaf_visits is not None:
+            cells = np.frombuffer(self._child_cells, dtype=np.int16, count=count) # type: ignore
+            amaf_visits = self._amaf_visits[cells] # type: ignore
+            amaf_means = (self._amaf_wins[cells] + 0.5) / (amaf_visits + 1) # type: ignore
+            beta = np.sqrt(rave / (3 * visits + rave))
+            means = (1 - beta) * means + beta * amaf_means
+        scores = means + EXPLORATION * np.sqrt(math.log(self.visits) / visits)
+        return self.child_nodes[int(scores.argmax())]
     
-    def backpropagation(self, result):
+    def backpropagation(self, result, count=1):
+        # count > 1 backs up that many playouts that all ended in result
         node = self
         while node is not None:
-            if node.move == None:
-                # means we're at root node
+            parent = node.parent
+            if parent is None:
+                # means we're at root node (a re-rooted tree keeps its move)
                 if node.colour == result:
-                    node.wins += 1
-                node.visits += 1
+                    node.wins += count
+                node.visits += count
                 break # root node reached
-            node.visits += 1
+            node.visits += count
 
-            if node.parent.colour == result: # type: ignore
-                node.wins += 1
+            if parent.colour == result:
+                node.wins += count
 
-            node = node.parent
+            parent._child_visits[node._index] = node.visits # type: ignore
+            parent._child_wins[node._index] = node.wins # type: ignore
+            node = parent
 
-    #Expansion
-    def expand(self, next_board, next_colour, move : Move):
-        # Get all moves played so far (by traversing up the parent chain)
-        played_moves = set()
+    def add_virtual_loss(self, count):
+        # visits without wins from here up to the root, so parallel searches
+        # avoid this path until its rollout is backed up. A negative count
+        # takes them off again
         node = self
-        while node is not None and node.move is not None:
-            played_moves.add(move)
-            node = node.parent
-
-        played_moves.add(move)
+        while node is not None:
+            node.visits += count
+            parent = node.parent
+            if parent is not None:
+                parent._child_visits[node._index] = node.visits # type: ignore
+            node = parent
 
-        # All possible moves for the board size
-        all_possible_moves = [Move(x, y) for x in range(next_board.size) for y in range(next_board.size)]
-        child_untried_moves = [m for m in all_possible_moves if m not in played_moves]
+    def amaf_update(self, result, red_cells, blue_cells):
+        # red_cells and blue_cells flag each cell held by that colour at the
+        # end of the playout. Every expanded node on the path counts its own
+        # colour's cells as if they had been played first from it
+        node = self
+        while node is not None:
+            if node.child_nodes:
+                if node._amaf_visits is None:
+                    node._amaf_visits = np.zeros(len(red_cells))
+                    node._amaf_wins = np.zeros(len(red_cells))
+                played = red_cells if node.colour == Colour.RED else blue_cells
+                node._amaf_visits += played
+                if node.colour == result:
+                    node._amaf_wins += played # type: ignore
+            node = node.parent
 
-        child = Node(next_board, next_colour, child_untried_moves, move=move, parent=self)
+    #Expansion
+    def expand(self, next_board, next_colour, move : Move):
+        # move must come from pop_untried_move. next_board is the position
+        # after move, only its empty-cell mask is kept as the child's
+        # untried moves, the MCTS loops rebuild positions by replaying moves
+        # from the root board
+        child = Node(next_colour, next_board.bits.empty(), move=move, parent=self)
+        if self._child_visits is None:
+            self._child_visits = array("d")
+            self._child_wins = array("d")
+            self._child_cells = array("h")
+        child._index = len(self.child_nodes)
         self.child_nodes.append(child)
-        self.untried_moves.remove(move)
+        self._child_visits.append(0.0)
+        self._child_wins.append(0.0) # type: ignore
+        self._child_cells.append(move.x * next_board.size + move.y) # type: ignore
         return child
-
-
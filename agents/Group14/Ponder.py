@@ -0,0 +1,88 @@
+import sys
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING
+
+from agents.Group14.Node import Node
+from src.Board import Board
+
+if TYPE_CHECKING:
+    from agents.Group14.MyAgentBest import MyAgentBest
+
+
+def free_threaded() -> bool:
+    """Returns whether the interpreter runs without the GIL."""
+
+    return not getattr(sys, "_is_gil_enabled", lambda: True)()
+
+
+class Ponderer:
+    """Keeps searching our tree in a background thread while the opponent
+    thinks.
+
+    start() is given the node reached by our last move and a private copy
+    of that position, and runs MCTS iterations on it until stop() is
+    called or time_limit seconds pass. The agent stops it at its next
+    make_move or when the engine ends the game; the limit only bounds a
+    thread that neither reaches. Iterations go through the agent's own
+    select_leaf, expand_leaf, simulate and backpropagate, so pondering
+    searches exactly as the agent does. The thread is a daemon and only
+    holds a weak reference to the agent, and stops once the agent is gone.
+
+    Only useful on a free-threaded build. Under the GIL the thread shares
+    the interpreter with an opponent in the same process, as in Game and
+    HexTournament, and takes CPU from their make_move while their clock
+    runs.
+    """
+
+    def __init__(self, agent: "MyAgentBest", time_limit: float):
+        self.time_limit = time_limit
+        self.rollouts = 0  # rollouts run by the last ponder
+        self._agent = weakref.ref(agent)
+        self._thread: threading.Thread | None = None
+        self._stop = threading.Event()
+
+    def start(self, root: Node, board: Board):
+        """Ponders on root, the node for board. board is copied, the caller
+        may keep using it.
+        """
+
+        self.stop()
+        self.rollouts = 0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(
+            target=self._run,
+            args=(root, board.copy(), self._stop, time.perf_counter() + self.time_limit),
+            daemon=True,
+        )
+        self._thread.start()
+
+    def stop(self) -> int:
+        """Stops pondering, waits for the current iteration to finish and
+        returns the number of rollouts run. The tree can be used again
+        once this returns.
+        """
+
+        if self._thread is None:
+            return 0
+        self._stop.set()
+        # the agent's finalizer can run on this thread when the thread drops
+        # the last reference to it, the loop then ends on its own
+        if self._thread is not threading.current_thread():
+            self._thread.join()
+        self._thread = None
+        return self.rollouts
+
+    def _run(self, root: Node, board: Board, stop: threading.Event, deadline: float):
+        board_state = board.copy()
+        while not stop.is_set() and time.perf_counter() < deadline:
+            agent = self._agent()
+            if agent is None:
+                return
+            board.copy_into(board_state)
+            node = agent.expand_leaf(agent.select_leaf(root, board_state), board_state)
+            agent.backpropagate(node, agent.simulate(node, board_state))
+            self.rollouts += agent.rollouts_per_iteration
+            # drop the strong reference before waiting on the next iteration
+            del agent
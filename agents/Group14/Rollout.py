@@ -0,0 +1,231 @@
+import random
+
+import numpy as np
+
+from src.BitBoard import BitBoard
+from src.Board import Board
+from src.Colour import Colour
+
+# Rollout policies selectable by the MCTS agents
+INCREMENTAL = "incremental"
+FILL = "fill"
+BRIDGE = "bridge"
+ROLLOUT_POLICIES = (INCREMENTAL, FILL, BRIDGE)
+
+_rng = np.random.default_rng()
+
+
+def stone_cells(stones: int, cells: int) -> np.ndarray:
+    """Unpacks a stone mask into one 0/1 entry per cell."""
+
+    packed = np.frombuffer(stones.to_bytes((cells + 7) // 8, "little"), dtype=np.uint8)
+    return np.unpackbits(packed, count=cells, bitorder="little")
+
+
+def incremental_rollout(board: Board, colour: Colour) -> Colour | None:
+    """Plays random stones onto board, alternating from colour, and checks
+    for a winner after every stone. Mutates board.
+    """
+
+    cells = board.bits.empty_cells()
+    random.shuffle(cells)
+
+    size = board.size
+    for cell in cells:
+        x, y = divmod(cell, size)
+        board.set_tile_colour(x, y, colour)
+        if board.has_ended(colour):
+            return colour
+        colour = Colour.opposite(colour)
+
+    # position was already decided before the rollout started
+    for colour in (Colour.RED, Colour.BLUE):
+        if board.has_ended(colour):
+            return colour
+    return None
+
+
+def fill_rollout(board: Board, colour: Colour) -> Colour:
+    """Fills every empty cell at once and checks the result a single time.
+
+    Hex cannot end in a draw, so a full board has exactly one winner, and
+    once a side is connected later stones cannot undo it. Giving colour a
+    random half of the empty cells (rounded up, as it moves first) and the
+    opponent the rest therefore has the same winner as playing the same
+    stones one at a time. Does not modify board.
+    """
+
+    return _fill(board, colour)[0]
+
+
+def _fill(board: Board, colour: Colour) -> tuple[Colour, BitBoard]:
+    bits = board.bits
+    cells = bits.empty_cells()
+    ours = 0
+    for cell in random.sample(cells, (len(cells) + 1) // 2):
+        ours |= 1 << cell
+    theirs = bits.empty() & ~ours
+
+    filled = bits.copy()
+    if colour == Colour.RED:
+        filled.red |= ours
+        filled.blue |= theirs
+    else:
+        filled.blue |= ours
+        filled.red |= theirs
+
+    if filled.connects(colour):
+        return colour, filled
+    return Colour.opposite(colour), filled
+
+
+def bridge_rollout(board: Board, colour: Colour) -> Colour:
+    """Plays random stones, alternating from colour, except that a stone
+    played into one of the two cells carrying an opponent two-bridge is
+    answered with the other carrier cell, saving the bridge. Does not
+    modify board.
+
+    The bridges a cell carries come from the precomputed
+    Geometry.bridge_carriers, so a simulated move costs a few table
+    lookups. As with fill_rollout, the board is played out to the end and
+    checked for a winner once.
+    """
+
+    return _bridge(board, colour)[0]
+
+
+def _bridge(board: Board, colour: Colour) -> tuple[Colour, BitBoard]:
+    bits = board.bits
+    geometry = bits.geometry
+    carriers = geometry.bridge_carriers
+
+    # owner of every cell, 0 empty, 1 red, 2 blue
+    owner = bytearray(
+        (stone_cells(bits.red, geometry.cells) + 2 * stone_cells(bits.blue, geometry.cells)).tobytes()
+    )
+    cells = bits.empty_cells()
+    random.shuffle(cells)
+
+    player = 1 if colour == Colour.RED else 2
+    reply = -1
+    left = len(cells)
+    order = iter(cells)
+    while left:
+        if reply >= 0:
+            cell = reply
+        else:
+            cell = next(order)
+            if owner[cell]:
+                # taken earlier as a reply
+                continue
+        owner[cell] = player
+        left -= 1
+
+        opponent = 3 - player
+        reply = -1
+        for other, end, far_end in carriers[cell]:
+            if owner[end] == opponent and owner[far_end] == opponent and not owner[other]:
+                reply = other
+                break
+        player = opponent
+
+    red_cells = np.frombuffer(owner, dtype=np.uint8) == 1
+    red = int.from_bytes(np.packbits(red_cells, bitorder="little").tobytes(), "little")
+    filled = bits.copy()
+    filled.red = red
+    filled.blue = geometry.full & ~red
+    if filled.connects(colour):
+        return colour, filled
+    return Colour.opposite(colour), filled
+
+
+def batch_fill_rollouts(board: Board, colour: Colour, count: int) -> int:
+    """Plays count fill rollouts from board at once and returns how many
+    colour won. Does not modify board.
+
+    Each rollout gives colour a random half of the empty cells (rounded up),
+    as fill_rollout does. The fills are then bit-sliced: every cell becomes
+    a column of uint64 words whose bit i is the cell's stone in rollout i,
+    so one flood fill over (size, size, count / 64) words checks 64
+    rollouts per word.
+    """
+
+    bits = board.bits
+    geometry = bits.geometry
+    size, cells = geometry.size, geometry.cells
+    empty = np.flatnonzero(stone_cells(bits.empty(), cells))
+    if len(empty) == 0:
+        return count if bits.connects(colour) else 0
+
+    # pad the batch to whole words, the padding rollouts have no stones
+    padded = -(-count // 64) * 64
+    ours = (len(empty) + 1) // 2
+    assigned = np.zeros((padded, len(empty)), dtype=bool)
+    assigned[:count, :ours] = True
+    assigned[:count] = _rng.permuted(assigned[:count], axis=1)
+
+    stones = np.zeros((padded, cells), dtype=bool)
+    stones[:count] = stone_cells(bits.stones(colour), cells)
+    stones[:, empty] = assigned
+
+    grid = stones.reshape(padded, size, size)
+    if colour == Colour.BLUE:
+        # the neighbourhood is symmetric in x and y, so blue's left to
+        # right is red's top to bottom on the transposed board
+        grid = grid.transpose(0, 2, 1)
+    sliced = np.packbits(grid.transpose(1, 2, 0), axis=-1, bitorder="little")
+    won = _connects_top_bottom(np.ascontiguousarray(sliced).view(np.uint64))
+    return int(np.unpackbits(won.view(np.uint8)).sum())
+
+
+def _connects_top_bottom(stones: np.ndarray) -> np.ndarray:
+    """Flood fills bit-sliced stone grids of shape (size, size, words) from
+    the top row and returns a (words,) array with the bits of the grids
+    that reach the bottom row set.
+    """
+
+    reached = np.zeros_like(stones)
+    reached[0] = stones[0]
+    while True:
+        grown = reached.copy()
+        grown[1:, :] |= reached[:-1, :]
+        grown[:-1, :] |= reached[1:, :]
+        grown[:, 1:] |= reached[:, :-1]
+        grown[:, :-1] |= reached[:, 1:]
+        grown[1:, :-1] |= reached[:-1, 1:]
+        grown[:-1, 1:] |= reached[1:, :-1]
+        grown &= stones
+        if np.array_equal(grown, reached):
+            return np.bitwise_or.reduce(reached[-1], axis=0)
+        reached = grown
+
+
+def rollout(policy: str, board: Board, colour: Colour) -> Colour | None:
+    """Runs one random playout with the named policy, colour to move."""
+
+    if policy == FILL:
+        return fill_rollout(board, colour)
+    elif policy == BRIDGE:
+        return bridge_rollout(board, colour)
+    elif policy == INCREMENTAL:
+        return incremental_rollout(board, colour)
+    else:
+        raise ValueError(f"Unknown rollout policy: {policy}")
+
+
+def rollout_stones(policy: str, board: Board, colour: Colour) -> tuple[Colour | None, int, int]:
+    """Like rollout, but also returns the red and blue stone masks of the
+    final position, for all-moves-as-first statistics.
+    """
+
+    if policy == FILL:
+        winner, filled = _fill(board, colour)
+        return winner, filled.red, filled.blue
+    elif policy == BRIDGE:
+        winner, filled = _bridge(board, colour)
+        return winner, filled.red, filled.blue
+    elif policy == INCREMENTAL:
+        winner = incremental_rollout(board, colour)
+        return winner, board.bits.red, board.bits.blue
+    else:
+        raise ValueError(f"Unknown rollout policy: {policy}")
@@ -0,0 +1,99 @@
+import multiprocessing
+import random
+import time
+import weakref
+
+from agents.Group14.Tree import Tree
+from src.BitBoard import BitBoard
+from src.Board import Board
+from src.Colour import Colour
+from src.Move import Move
+
+
+def search_root(task: tuple) -> list[int]:
+    """Runs one independent search in a worker process and returns the
+    visit count of every root move, indexed by cell.
+    """
+
+    board_size, packed, colour, iterations, rollout_policy, time_limit, seed = task
+    random.seed(seed)
+    # clocks are per process, so the limit travels as a duration
+    deadline = time.perf_counter() + time_limit if time_limit is not None else None
+
+    bits = BitBoard.from_bytes(board_size, packed)
+    board = Board.from_stones(board_size, bits.red, bits.blue)
+    tree = Tree(board_size, colour)
+    tree.search(board, iterations, rollout_policy, deadline)
+
+    visits = [0] * (board_size * board_size)
+    first = tree.first_child[tree.root]
+    for child in range(first, first + tree.child_count[tree.root]):
+        visits[tree.move[child]] = tree.visits[child]
+    return visits
+
+
+def _terminate(pool):
+    if pool is not None:
+        pool.terminate()
+
+
+class RootParallelSearch:
+    """Root parallelisation: every worker grows its own tree from the same
+    position and the root visit counts are summed before picking a move.
+    The trees share nothing, so workers only exchange the position going
+    out and one list of counts coming back.
+
+    The pool is started when the search is created, so an agent that keeps
+    one for the whole game pays the start-up cost once rather than per move.
+    A daemonic process, such as a HexTournament game worker, may not start
+    children, so there the search runs serially in-process: one tree with
+    the iterations of all workers.
+    """
+
+    def __init__(self, workers: int):
+        self.workers = workers
+        self.rollouts = 0
+        self._pool = None
+        if not multiprocessing.current_process().daemon:
+            self._pool = multiprocessing.Pool(workers)
+        # stop the workers once the owning agent is garbage collected
+        self._finalizer = weakref.finalize(self, _terminate, self._pool)
+
+    def search(
+        self,
+        board: Board,
+        colour: Colour,
+        iterations: int,
+        rollout_policy: str,
+        time_limit: float | None = None,
+    ) -> Move:
+        """Searches board with colour to move, up to iterations per worker
+        and for at most time_limit seconds, and returns the move with the
+        most visits over all workers. The number of rollouts run is left in
+        self.rollouts.
+        """
+
+        packed = board.bits.to_bytes()
+        if self._pool is None:
+            task = (
+                board.size, packed, colour, iterations * self.workers,
+                rollout_policy, time_limit, random.getrandbits(64),
+            )
+            merged = search_root(task)
+        else:
+            tasks = [
+                (
+                    board.size, packed, colour, iterations,
+                    rollout_policy, time_limit, random.getrandbits(64),
+                )
+                for _ in range(self.workers)
+            ]
+            merged = [sum(counts) for counts in zip(*self._pool.map(search_root, tasks))]
+        self.rollouts = sum(merged)
+        # with no visits at all every count is 0, so only empty cells are
+        # candidates
+        cell = max(board.bits.empty_cells(), key=merged.__getitem__)
+        return Move(*divmod(cell, board.size))
+
+    def close(self):
+        self._finalizer()
@@ -0,0 +1,72 @@
+import time
+
+from src.Game import Game
+
+
+class TimeManager:
+    """Splits the game clock over the moves we still expect to play.
+
+    Each search gets (remaining time - reserve) / expected moves left, where
+    the expected number of our moves shrinks with the empty cells on the
+    board. Time is charged from start_move to end_move, so agents call both
+    around their search; moves returned before searching (opening book,
+    forced replies) are cheap and not charged.
+    """
+
+    def __init__(
+        self,
+        total_time: float = Game.MAXIMUM_TIME / 10**9,
+        reserve: float = 10.0,
+        moves_per_empty_cell: float = 0.3,
+        min_moves_left: int = 5,
+        min_budget: float = 0.05,
+    ):
+        self.total_time = total_time
+        # kept back for moves that are not charged and engine overhead
+        self.reserve = reserve
+        # a game ends well before the board is full, and only every other
+        # stone is ours
+        self.moves_per_empty_cell = moves_per_empty_cell
+        self.min_moves_left = min_moves_left
+        self.min_budget = min_budget
+
+        self.used = 0.0
+        self.budget = 0.0
+        self.rollouts_per_move: list[int] = []
+        self._move_start = 0.0
+        self._deadline = 0.0
+
+    @property
+    def remaining(self) -> float:
+        return self.total_time - self.used
+
+    def start_move(self, empty_cells: int) -> float:
+        """Starts the clock for a search on a board with empty_cells empty
+        cells and returns the seconds allowed for it.
+        """
+
+        moves_left = max(self.min_moves_left, round(empty_cells * self.moves_per_empty_cell))
+        self.budget = max(self.min_budget, (self.remaining - self.reserve) / moves_left)
+        self._move_start = time.perf_counter()
+        self._deadline = self._move_start + self.budget
+        return self.budget
+
+    @property
+    def deadline(self) -> float:
+        """The time.perf_counter() value at which the search should stop."""
+
+        return self._deadline
+
+    def expired(self) -> bool:
+        return time.perf_counter() >= self._deadline
+
+    def time_left(self) -> float:
+        """Seconds until the deadline of the current move, at least 0."""
+
+        return max(0.0, self._deadline - time.perf_counter())
+
+    def end_move(self, rollouts: int):
+        """Stops the clock and records how many rollouts the search ran."""
+
+        self.used += time.perf_counter() - self._move_start
+        self.rollouts_per_move.append(rollouts)
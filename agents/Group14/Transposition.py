@@ -0,0 +1,191 @@
+import math
+import random
+import time
+
+import numpy as np
+
+from agents.Group14.Node import EXPLORATION
+from agents.Group14.Rollout import rollout, stone_cells
+from src.Board import Board
+from src.Colour import Colour
+from src.Geometry import Geometry
+from src.Move import Move
+
+
+class TranspositionTable:
+    """Fixed-size table of MCTS statistics keyed by the Zobrist hash of a
+    position, so every move order reaching a position shares one entry.
+
+    Entries live in NumPy columns: key, visits, red_wins (playouts through
+    the position that red won) and stones (stones on the board, used to
+    age entries). Slots are grouped in buckets of two, picked by key. When
+    both slots of a bucket are taken, a new position replaces an entry from
+    a position with fewer stones than the current root, which can no longer
+    be reached, or else the less visited one.
+    """
+
+    ENTRY_BYTES = 8 + 4 + 4 + 2
+
+    def __init__(self, memory: int):
+        capacity = max(2, memory // self.ENTRY_BYTES) & ~1
+        self.buckets = capacity // 2
+        self.keys = np.zeros(capacity, dtype=np.uint64)
+        self.visits = np.zeros(capacity, dtype=np.int32)
+        self.red_wins = np.zeros(capacity, dtype=np.int32)
+        self.stones = np.zeros(capacity, dtype=np.int16)
+        # stones on the board being searched, entries below it are stale
+        self.root_stones = 0
+
+    def __len__(self) -> int:
+        return len(self.keys)
+
+    def nbytes(self) -> int:
+        return self.keys.nbytes + self.visits.nbytes + self.red_wins.nbytes + self.stones.nbytes
+
+    def lookup(self, keys: np.ndarray) -> np.ndarray:
+        """Returns the slot of each key, or -1 where it has no entry."""
+
+        first = (keys % np.uint64(self.buckets)).astype(np.int64) * 2
+        second = first + 1
+        found_first = (self.keys[first] == keys) & (self.visits[first] > 0)
+        found_second = (self.keys[second] == keys) & (self.visits[second] > 0)
+        return np.where(found_first, first, np.where(found_second, second, -1))
+
+    def probe(self, key: int) -> int:
+        """Returns the slot holding key, or -1."""
+
+        first = (key % self.buckets) * 2
+        for slot in (first, first + 1):
+            if self.visits[slot] > 0 and self.keys[slot] == key:
+                return slot
+        return -1
+
+    def update(self, key: int, stones: int, red_won: bool):
+        """Adds one playout to the entry for key, creating it if needed."""
+
+        slot = self.probe(key)
+        if slot == -1:
+            slot = self._replace(key, stones)
+        self.visits[slot] += 1
+        if red_won:
+            self.red_wins[slot] += 1
+
+    def _replace(self, key: int, stones: int) -> int:
+        first = (key % self.buckets) * 2
+        second = first + 1
+        if self.visits[first] == 0:
+            slot = first
+        elif self.visits[second] == 0:
+            slot = second
+        elif self.stones[first] < self.root_stones:
+            slot = first
+        elif self.stones[second] < self.root_stones:
+            slot = second
+        elif self.visits[first] <= self.visits[second]:
+            slot = first
+        else:
+            slot = second
+
+        self.keys[slot] = key
+        self.visits[slot] = 0
+        self.red_wins[slot] = 0
+        self.stones[slot] = stones
+        return slot
+
+
+class TranspositionSearch:
+    """MCTS over positions rather than move sequences. Instead of a tree of
+    Node objects, each step looks up the statistics of every child position
+    in a TranspositionTable, so a result backed up along one move order is
+    seen by every path to the same position. The table outlives a single
+    search, so the statistics also carry over between turns.
+    """
+
+    def __init__(self, memory: int):
+        self.table = TranspositionTable(memory)
+
+    def search(
+        self,
+        board: Board,
+        colour: Colour,
+        iterations: int,
+        rollout_policy: str,
+        deadline: float | None = None,
+    ) -> int:
+        """Runs up to iterations from board with colour to move, stopping
+        once time.perf_counter() passes deadline. Returns the iterations run.
+        """
+
+        table = self.table
+        geometry = Geometry.of(board.size)
+        size = geometry.size
+        cells = geometry.cells
+        zobrist = {c: np.array(geometry.zobrist[c], dtype=np.uint64) for c in Colour}
+
+        bits = board.bits
+        root_key = board.zobrist_key
+        root_stones = (bits.red | bits.blue).bit_count()
+        table.root_stones = root_stones
+
+        board_state = board.copy()
+        for done in range(iterations):
+            if deadline is not None and time.perf_counter() >= deadline:
+                return done
+            board.copy_into(board_state)
+
+            key = root_key
+            to_move = colour
+            path = [root_key]
+            winner = None
+            while True:
+                empty = np.flatnonzero(stone_cells(board_state.bits.empty(), cells))
+                child_keys = np.uint64(key) ^ zobrist[to_move][empty]
+                slots = table.lookup(child_keys)
+
+                #EXPANSION of an unseen child, else SELECTION by UCB1
+                unseen = np.flatnonzero(slots < 0)
+                if len(unseen):
+                    i = int(unseen[random.randrange(len(unseen))])
+                    expanded = True
+                else:
+                    visits = table.visits[slots]
+                    means = table.red_wins[slots] / visits
+                    if to_move == Colour.BLUE:
+                        means = 1 - means
+                    log_visits = math.log(visits.sum())
+                    scores = means + EXPLORATION * np.sqrt(log_visits / visits)
+                    i = int(scores.argmax())
+                    expanded = False
+
+                x, y = divmod(int(empty[i]), size)
+                board_state.set_tile_colour(x, y, to_move)
+                key = int(child_keys[i])
+                path.append(key)
+                if board_state.has_ended(to_move):
+                    winner = to_move
+                    break
+                to_move = Colour.opposite(to_move)
+                if expanded:
+                    break
+
+            #SIMULATION
+            if winner is None:
+                winner = rollout(rollout_policy, board_state, to_move)
+
+            #BACKPROPAGATION
+            red_won = winner == Colour.RED
+            for depth, path_key in enumerate(path):
+                table.update(path_key, root_stones + depth, red_won)
+
+        return iterations
+
+    def best_move(self, board: Board, colour: Colour) -> Move:
+        """Returns the most visited move from board with colour to move."""
+
+        geometry = Geometry.of(board.size)
+        empty = np.flatnonzero(stone_cells(board.bits.empty(), geometry.cells))
+        zobrist = np.array(geometry.zobrist[colour], dtype=np.uint64)
+        slots = self.table.lookup(np.uint64(board.zobrist_key) ^ zobrist[empty])
+        visits = np.where(slots >= 0, self.table.visits[slots], 0)
+        return geometry.moves[int(empty[int(visits.argmax())])]
+
@@ -0,0 +1,200 @@
+import math
+import random
+import time
+from array import array
+
+import numpy as np
+
+from agents.Group14.Node import EXPLORATION
+from agents.Group14.Rollout import rollout
+from src.Board import Board
+from src.Colour import Colour
+from src.Move import Move
+
+
+class Tree:
+    """MCTS tree stored as parallel arrays (struct of arrays) instead of one
+    Python object per node.
+
+    Node i is described by visits[i], wins[i], move[i] (the cell played to
+    reach it, -1 for the root), mover[i] (Colour.value of the player who
+    played that cell), parent[i], first_child[i] and child_count[i]. All
+    children of a node are allocated together as one contiguous block the
+    first time the node is expanded, one per empty cell, so selection walks
+    a slice of each column. No board is stored per node; positions are
+    rebuilt by replaying moves from the root board.
+    """
+
+    def __init__(self, board_size: int, colour: Colour):
+        self.board_size = board_size
+        self.root = 0
+        self.visits = array("i", [0])
+        self.wins = array("i", [0])
+        self.move = array("h", [-1])
+        # the root is reached by the opponent of the player to move
+        self.mover = array("b", [Colour.opposite(colour).value])
+        self.parent = array("i", [-1])
+        self.first_child = array("i", [-1])
+        self.child_count = array("h", [0])
+
+    def __len__(self) -> int:
+        return len(self.visits)
+
+    def nbytes(self) -> int:
+        """Returns the memory used by the node columns."""
+
+        columns = (
+            self.visits, self.wins, self.move, self.mover,
+            self.parent, self.first_child, self.child_count,
+        )
+        return sum(column.itemsize * len(column) for column in columns)
+
+    def expand(self, node: int, cells: list[int], mover: int):
+        """Allocates one child of node per cell, all played by mover."""
+
+        count = len(cells)
+        self.first_child[node] = len(self.visits)
+        self.child_count[node] = count
+        self.visits.extend(array("i", [0]) * count)
+        self.wins.extend(array("i", [0]) * count)
+        self.move.extend(array("h", cells))
+        self.mover.extend(array("b", [mover]) * count)
+        self.parent.extend(array("i", [node]) * count)
+        self.first_child.extend(array("i", [-1]) * count)
+        self.child_count.extend(array("h", [0]) * count)
+
+    def select(self, node: int) -> int:
+        """Picks a random unvisited child, or else the child with the best
+        UCB1 score. The children are one contiguous block, so their scores
+        are computed over zero-copy NumPy views of the columns.
+        """
+
+        first = self.first_child[node]
+        count = self.child_count[node]
+        visits = np.frombuffer(
+            self.visits, dtype=np.intc, count=count, offset=first * self.visits.itemsize
+        )
+        unvisited = np.flatnonzero(visits == 0)
+        if len(unvisited):
+            return first + random.choice(unvisited.tolist())
+
+        wins = np.frombuffer(
+            self.wins, dtype=np.intc, count=count, offset=first * self.wins.itemsize
+        )
+        log_visits = math.log(self.visits[node])
+        scores = wins / visits + EXPLORATION * np.sqrt(log_visits / visits)
+        return first + int(scores.argmax())
+
+    def search(
+        self, board: Board, iterations: int, rollout_policy: str, deadline: float | None = None
+    ) -> int:
+        """Runs up to iterations MCTS iterations from board, which must be the
+        root position, stopping early once time.perf_counter() passes
+        deadline. Returns the number of iterations run.
+        """
+
+        size = self.board_size
+        board_state = board.copy()
+        for done in range(iterations):
+            if deadline is not None and time.perf_counter() >= deadline:
+                return done
+            board.copy_into(board_state)
+            node = self.root
+
+            #SELECTION and EXPANSION
+            # walk down until a child is reached for the first time
+            while True:
+                if self.child_count[node] == 0:
+                    cells = board_state.bits.empty_cells()
+                    if not cells:
+                        break  # board full
+                    self.expand(node, cells, 1 - self.mover[node])
+
+                child = self.select(node)
+                x, y = divmod(self.move[child], size)
+                board_state.set_tile_colour(x, y, Colour(self.mover[child]))
+                node = child
+                if self.visits[child] == 0:
+                    break
+
+            #SIMULATION
+            to_move = Colour(1 - self.mover[node])
+            winner = rollout(rollout_policy, board_state, to_move)
+            winner_value = winner.value if winner is not None else -1
+
+            #BACKPROPAGATION
+            while node != -1:
+                self.visits[node] += 1
+                if self.mover[node] == winner_value:
+                    self.wins[node] += 1
+                node = self.parent[node]
+
+        return iterations
+
+    def most_visited_child(self, node: int) -> int:
+        first = self.first_child[node]
+        children = range(first, first + self.child_count[node])
+        return max(children, key=self.visits.__getitem__)
+
+    def best_move(self) -> Move:
+        """Returns the most visited move from the root."""
+
+        child = self.most_visited_child(self.root)
+        return Move(*divmod(self.move[child], self.board_size))
+
+    def find_child(self, node: int, move: Move) -> int:
+        """Returns the child of node reached by move, or -1."""
+
+        cell = move.x * self.board_size + move.y
+        first = self.first_child[node]
+        for child in range(first, first + self.child_count[node]):
+            if self.move[child] == cell:
+                return child
+        return -1
+
+    def advance(self, move: Move) -> "Tree | None":
+        """Returns a new tree holding only the subtree reached from the root
+        by move, or None if that move was never explored.
+        """
+
+        old_root = self.find_child(self.root, move)
+        if old_root == -1 or self.visits[old_root] == 0:
+            return None
+
+        tree = Tree.__new__(Tree)
+        tree.board_size = self.board_size
+        tree.root = 0
+        tree.visits = array("i", [self.visits[old_root]])
+        tree.wins = array("i", [self.wins[old_root]])
+        tree.move = array("h", [self.move[old_root]])
+        tree.mover = array("b", [self.mover[old_root]])
+        tree.parent = array("i", [-1])
+        tree.first_child = array("i", [-1])
+        tree.child_count = array("h", [0])
+
+        # copy breadth first so every child block stays contiguous
+        queue = [(old_root, 0)]
+        head = 0
+        while head < len(queue):
+            old, new = queue[head]
+            head += 1
+            count = self.child_count[old]
+            if count == 0:
+                continue
+
+            first = self.first_child[old]
+            new_first = len(tree.visits)
+            tree.first_child[new] = new_first
+            tree.child_count[new] = count
+            block = slice(first, first + count)
+            tree.visits.extend(self.visits[block])
+            tree.wins.extend(self.wins[block])
+            tree.move.extend(self.move[block])
+            tree.mover.extend(self.mover[block])
+            tree.parent.extend(array("i", [new]) * count)
+            tree.first_child.extend(array("i", [-1]) * count)
+            tree.child_count.extend(array("h", [0]) * count)
+            for offset in range(count):
+                queue.append((first + offset, new_first + offset))
+
+        return tree
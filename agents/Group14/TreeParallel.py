@@ -0,0 +1,102 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from agents.Group14.Node import Node
+from agents.Group14.Rollout import rollout
+from src.Board import Board
+from src.Colour import Colour
+
+# visits added along a path while its rollout is running
+VIRTUAL_LOSS = 3
+
+
+class TreeParallelSearch:
+    """Tree parallelisation: several threads run MCTS iterations on one
+    shared Node tree.
+
+    Selection, expansion and backpropagation hold a single tree lock, while
+    rollouts run outside it. A thread that picks a path adds virtual_loss
+    visits without wins along it before its rollout and removes them
+    afterwards. Other threads therefore see that path as worse and spread
+    over different branches instead of queueing on the same leaf.
+
+    On a free-threaded CPython build the rollouts run in parallel. Under
+    the GIL the threads take turns, so throughput stays close to a single
+    thread and the search behaves like a serial one with a little extra
+    exploration.
+    """
+
+    def __init__(self, threads: int, virtual_loss: int = VIRTUAL_LOSS):
+        self.threads = threads
+        self.virtual_loss = virtual_loss
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(threads)
+
+    def search(
+        self,
+        root: Node,
+        board: Board,
+        iterations: int,
+        rollout_policy: str,
+        deadline: float | None = None,
+    ) -> int:
+        """Runs up to iterations in total over all threads on the tree under
+        root, which must be the node for board, stopping once
+        time.perf_counter() passes deadline. Returns the iterations run.
+        """
+
+        share, extra = divmod(iterations, self.threads)
+        futures = [
+            self._executor.submit(
+                self._run, root, board, share + (1 if i < extra else 0),
+                rollout_policy, deadline,
+            )
+            for i in range(self.threads)
+        ]
+        return sum(future.result() for future in futures)
+
+    def _run(
+        self,
+        root: Node,
+        board: Board,
+        iterations: int,
+        rollout_policy: str,
+        deadline: float | None,
+    ) -> int:
+        lock = self._lock
+        virtual_loss = self.virtual_loss
+        board_state = board.copy()
+        for done in range(iterations):
+            if deadline is not None and time.perf_counter() >= deadline:
+                return done
+            board.copy_into(board_state)
+
+            with lock:
+                #SELECTION
+                node = root
+                while not node.has_untried_moves() and node.child_nodes:
+                    child = node.best_child()
+                    move = child.move
+                    board_state.set_tile_colour(move.x, move.y, node.colour) # type: ignore
+                    node = child
+
+                #EXPANSION
+                if node.has_untried_moves():
+                    move = node.pop_untried_move(board.size)
+                    board_state.set_tile_colour(move.x, move.y, node.colour)
+                    node = node.expand(board_state, Colour.opposite(node.colour), move)
+
+                node.add_virtual_loss(virtual_loss)
+
+            #SIMULATION
+            winner = rollout(rollout_policy, board_state, node.colour)
+
+            #BACKPROPAGATION
+            with lock:
+                node.add_virtual_loss(-virtual_loss)
+                node.backpropagation(winner)
+        return iterations
+
+    def close(self):
+        self._executor.shutdown()
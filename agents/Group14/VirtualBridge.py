@@ -1,3 +1,5 @@
+from src.Board import Board
+from src.Colour import Colour
 from src.Move import Move
 
 
@@ -5,3 +7,101 @@ class VirtualBridge:
     def __init__(self, end1: Move, end2: Move | None, links: list[Move]):
         self.ends = (end1, end2)
         self.links = links
+
+    @staticmethod
+    def find(board: Board, move: Move, colour: Colour) -> list["VirtualBridge"]:
+        """Returns the bridges from colour's stone at move to colour's other
+        stones whose two carrier cells are still empty, looked up in the
+        board's precomputed Geometry.bridges.
+        """
+
+        bits = board.bits
+        geometry = bits.geometry
+        cell = move.x * geometry.size + move.y
+        stones = bits.stones(colour)
+        if not (stones >> cell) & 1:
+            return []
+
+        empty = bits.empty()
+        moves = geometry.moves
+        return [
+            VirtualBridge(moves[cell], moves[partner], [moves[carrier], moves[other]])
+            for partner, carrier, other in geometry.bridges[cell]
+            if (stones >> partner) & 1 and (empty >> carrier) & 1 and (empty >> other) & 1
+        ]
+
+    @staticmethod
+    def find_edge(board: Board, move: Move, colour: Colour) -> list["VirtualBridge"]:
+        """Returns the edge templates joining colour's stone at move to one
+        of colour's goal edges whose two edge cells are still empty. Their
+        second end is None.
+        """
+
+        bits = board.bits
+        geometry = bits.geometry
+        cell = move.x * geometry.size + move.y
+        if not (bits.stones(colour) >> cell) & 1:
+            return []
+
+        empty = bits.empty()
+        moves = geometry.moves
+        return [
+            VirtualBridge(moves[cell], None, [moves[carrier], moves[other]])
+            for carrier, other in geometry.edge_templates[colour][cell]
+            if (empty >> carrier) & 1 and (empty >> other) & 1
+        ]
+
+
+class BridgeIndex:
+    """Our open virtual bridges, indexed by carrier cell.
+
+    A bridge is stored once under its pair of carrier cells, which no other
+    bridge shares, so adding a bridge already known does nothing. Each
+    carrier cell maps to the bridges it carries, so when a stone lands on a
+    cell, fill() finds and drops the bridges through it without scanning
+    the rest: an intruded bridge must be answered, and one we filled
+    ourselves is solid and needs no more watching.
+    """
+
+    def __init__(self):
+        self._bridges: dict[frozenset[Move], VirtualBridge] = {}
+        self._by_carrier: dict[Move, dict[frozenset[Move], VirtualBridge]] = {}
+
+    def __len__(self) -> int:
+        return len(self._bridges)
+
+    def __iter__(self):
+        return iter(self._bridges.values())
+
+    def add(self, bridge: VirtualBridge) -> bool:
+        """Adds bridge and returns True, or False if it is already indexed."""
+
+        key = frozenset(bridge.links)
+        if key in self._bridges:
+            return False
+        self._bridges[key] = bridge
+        for link in bridge.links:
+            self._by_carrier.setdefault(link, {})[key] = bridge
+        return True
+
+    def fill(self, move: Move) -> list[VirtualBridge]:
+        """Drops the bridges carried by the cell at move, now that a stone
+        is on it, and returns them.
+        """
+
+        carried = self._by_carrier.pop(move, None)
+        if carried is None:
+            return []
+        for key, bridge in carried.items():
+            del self._bridges[key]
+            for link in bridge.links:
+                if link != move:
+                    others = self._by_carrier[link]
+                    del others[key]
+                    if not others:
+                        del self._by_carrier[link]
+        return list(carried.values())
+
+    def clear(self):
+        self._bridges.clear()
+        self._by_carrier.clear()
@@ -0,0 +1,407 @@
+"""Micro-benchmarks for the Group14 agents.
+
+Run from the repository root, e.g.
+    python -m agents.Group14.benchmark rollouts
+"""
+import argparse
+import random
+import sys
+import time
+import tracemalloc
+
+import src.AgentBase
+from agents.Group14.LeafParallel import LeafParallelRollouts
+from agents.Group14.Node import Node
+from agents.Group14.RootParallel import RootParallelSearch
+from agents.Group14.Rollout import FILL, ROLLOUT_POLICIES, batch_fill_rollouts, rollout
+from agents.Group14.Tree import Tree
+from agents.Group14.TreeParallel import TreeParallelSearch
+from agents.TestAgents.ValidAgent import ValidAgent
+from src.Board import Board
+from src.Colour import Colour
+from src.Game import Game
+from src.Move import Move
+from src.Player import Player
+
+
+def random_position(board_size: int, stones: int, seed: int) -> Board:
+    """Returns a board with the given number of random stones, alternating
+    red and blue, that neither side has won yet.
+    """
+
+    rng = random.Random(seed)
+    while True:
+        board = Board(board_size)
+        cells = [(x, y) for x in range(board_size) for y in range(board_size)]
+        rng.shuffle(cells)
+        colour = Colour.RED
+        for x, y in cells[:stones]:
+            board.set_tile_colour(x, y, colour)
+            colour = Colour.opposite(colour)
+        if not board.has_ended(Colour.RED) and not board.has_ended(Colour.BLUE):
+            return board
+
+
+def bench_hash(args):
+    # the engine fingerprints both players before and after every move
+    game = Game(
+        Player("Player1", ValidAgent(Colour.RED)),
+        Player("Player2", ValidAgent(Colour.BLUE)),
+    )
+
+    def uncached_turn():
+        src.AgentBase._SOURCE_HASHES.clear()
+        game._players_fingerprint()
+        src.AgentBase._SOURCE_HASHES.clear()
+        game._players_fingerprint()
+
+    def cached_turn():
+        game._players_fingerprint()
+        game._players_fingerprint()
+
+    print(f"{'source hash':<12} {'us/turn':>8}")
+    for name, turn in (("uncached", uncached_turn), ("cached", cached_turn)):
+        start = time.perf_counter()
+        for _ in range(args.turns):
+            turn()
+        elapsed = time.perf_counter() - start
+        print(f"{name:<12} {elapsed / args.turns * 1e6:>8.1f}")
+
+
+def bench_rollouts(args):
+    print(f"{'policy':<12} {'stones':>6} {'rollouts/s':>12}")
+    for stones in args.stones:
+        position = random_position(args.board_size, stones, args.seed)
+        for policy in ROLLOUT_POLICIES:
+            snapshot = position.snapshot()
+            start = time.perf_counter()
+            for _ in range(args.rollouts):
+                rollout(policy, position, Colour.RED)
+                position.restore(snapshot)
+            elapsed = time.perf_counter() - start
+            print(f"{policy:<12} {stones:>6} {args.rollouts / elapsed:>12.0f}")
+
+
+def build_node_tree(
+    board: Board, iterations: int, keep_boards: bool, deadline: float | None = None
+) -> Node:
+    """Runs the MyAgentBest Node search loop and returns the whole tree.
+    keep_boards attaches a board copy to every node, as expansion used to.
+    The loop stops early once time.perf_counter() passes deadline.
+    """
+
+    root = Node(Colour.RED, board.bits.empty())
+    board_state = board.copy()
+    for _ in range(iterations):
+        if deadline is not None and time.perf_counter() >= deadline:
+            break
+        board.copy_into(board_state)
+        node = root
+        while not node.has_untried_moves() and node.child_nodes:
+            child = node.best_child()
+            board_state.set_tile_colour(child.move.x, child.move.y, node.colour)
+            node = child
+        if node.has_untried_moves():
+            move = node.pop_untried_move(board.size)
+            board_state.set_tile_colour(move.x, move.y, node.colour)
+            node = node.expand(board_state, Colour.opposite(node.colour), move)
+            if keep_boards:
+                node.board = board_state.copy()
+        node.backpropagation(rollout(FILL, board_state, node.colour))
+    return root
+
+
+def count_nodes(tree: Node | Tree) -> tuple[int, int]:
+    """Returns the number of nodes in tree and how many of them were
+    visited. Tree allocates one child per empty cell when it expands a
+    node, so most of its nodes are never visited.
+    """
+
+    if isinstance(tree, Tree):
+        return len(tree), sum(1 for visits in tree.visits if visits)
+    nodes = visited = 0
+    stack = [tree]
+    while stack:
+        node = stack.pop()
+        nodes += 1
+        visited += node.visits > 0
+        stack.extend(node.child_nodes)
+    return nodes, visited
+
+
+def bench_memory(args):
+    board = random_position(args.board_size, args.stones, args.seed)
+    builders = {
+        "node+board": lambda: build_node_tree(board, args.iterations, True),
+        "node": lambda: build_node_tree(board, args.iterations, False),
+        "array": lambda: array_tree(board, args.iterations),
+    }
+
+    # per visited node, so storages are compared at the same search work
+    print(f"{'storage':<12} {'nodes':>8} {'visited':>8} {'bytes/visited':>14} {'visited/GB':>12}")
+    for name, build in builders.items():
+        random.seed(args.seed)
+        tracemalloc.start()
+        tree = build()
+        used, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        nodes, visited = count_nodes(tree)
+        per_node = used / visited
+        print(
+            f"{name:<12} {nodes:>8} {visited:>8} {per_node:>14.0f} {2**30 / per_node:>12,.0f}"
+        )
+
+
+def array_tree(board: Board, iterations: int) -> Tree:
+    tree = Tree(board.size, Colour.RED)
+    tree.search(board, iterations, FILL)
+    return tree
+
+
+def list_expand_all(board: Board):
+    """Expands every move of a root with the old list bookkeeping: a fresh
+    Move list per child and list.remove for the parent.
+    """
+
+    size = board.size
+    untried = [Move(*divmod(cell, size)) for cell in board.bits.empty_cells()]
+    children = []
+    while untried:
+        move = random.choice(untried)
+        board.set_tile_colour(move.x, move.y, Colour.RED)
+        children.append(
+            [Move(*divmod(cell, size)) for cell in board.bits.empty_cells()]
+        )
+        untried.remove(move)
+        board.set_tile_colour(move.x, move.y, None)
+    return children
+
+
+def node_expand_all(board: Board):
+    """Expands every move of a root with Node.pop_untried_move."""
+
+    root = Node(Colour.RED, board.bits.empty())
+    while root.has_untried_moves():
+        move = root.pop_untried_move(board.size)
+        board.set_tile_colour(move.x, move.y, Colour.RED)
+        root.expand(board, Colour.BLUE, move)
+        board.set_tile_colour(move.x, move.y, None)
+    return root
+
+
+def bench_expand(args):
+    print(f"{'size':>4} {'bookkeeping':<12} {'expansions/s':>13}")
+    for size in args.sizes:
+        board = Board(size)
+        for name, expand_all in (("list", list_expand_all), ("node", node_expand_all)):
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                expand_all(board)
+            elapsed = time.perf_counter() - start
+            rate = args.repeats * size * size / elapsed
+            print(f"{size:>4} {name:<12} {rate:>13.0f}")
+
+
+def visited_root(board_size: int, seed: int) -> tuple[Node, Tree]:
+    """Returns a Node root and a Tree root with one visited child per cell
+    and the same random statistics.
+    """
+
+    rng = random.Random(seed)
+    board = Board(board_size)
+    root = Node(Colour.RED, board.bits.empty())
+    tree = Tree(board_size, Colour.RED)
+    tree.expand(tree.root, board.bits.empty_cells(), Colour.RED.value)
+    while root.has_untried_moves():
+        child = root.expand(board, Colour.BLUE, root.pop_untried_move(board_size))
+        visits = rng.randint(1, 50)
+        for result in rng.choices((Colour.RED, Colour.BLUE), k=visits):
+            child.backpropagation(result)
+    for child in root.child_nodes:
+        cell = child.move.x * board_size + child.move.y
+        tree.visits[tree.first_child[0] + cell] = child.visits
+        tree.wins[tree.first_child[0] + cell] = child.wins
+    tree.visits[0] = root.visits
+    return root, tree
+
+
+def bench_select(args):
+    print(f"{'size':>4} {'selection':<12} {'selections/s':>13}")
+    for size in args.sizes:
+        root, tree = visited_root(size, args.seed)
+        selectors = {
+            "ucb1 calls": lambda: max(root.child_nodes, key=root.ucb1),
+            "best_child": root.best_child,
+            "Tree.select": lambda: tree.select(tree.root),
+        }
+        for name, select in selectors.items():
+            start = time.perf_counter()
+            for _ in range(args.repeats):
+                select()
+            elapsed = time.perf_counter() - start
+            print(f"{size:>4} {name:<12} {args.repeats / elapsed:>13.0f}")
+
+
+def bench_parallel(args):
+    board = random_position(args.board_size, args.stones, args.seed)
+    print(f"{'workers':>7} {'s/move':>8} {'rollouts/s':>11} {'speedup':>8}")
+    base_rate = None
+    for workers in args.workers:
+        search = RootParallelSearch(workers)
+        # first call warms up the workers
+        search.search(board, Colour.RED, 1, FILL)
+        start = time.perf_counter()
+        for _ in range(args.moves):
+            search.search(board, Colour.RED, args.iterations, FILL)
+        elapsed = (time.perf_counter() - start) / args.moves
+        search.close()
+
+        rate = workers * args.iterations / elapsed
+        if base_rate is None:
+            base_rate = rate
+        print(f"{workers:>7} {elapsed:>8.3f} {rate:>11.0f} {rate / base_rate:>7.2f}x")
+
+
+def bench_leaf(args):
+    board = random_position(args.board_size, args.stones, args.seed)
+    print(f"{'workers':>7} {'batch':>6} {'rollouts/s':>11} {'speedup':>8}")
+
+    start = time.perf_counter()
+    for _ in range(args.leaves * args.rollouts):
+        rollout(FILL, board, Colour.RED)
+    base_rate = args.leaves * args.rollouts / (time.perf_counter() - start)
+    print(f"{'serial':>7} {1:>6} {base_rate:>11.0f} {1:>7.2f}x")
+
+    for workers in args.workers:
+        leaves = LeafParallelRollouts(workers, args.rollouts)
+        leaves.run(board, Colour.RED, FILL)  # warm up the workers
+        start = time.perf_counter()
+        for _ in range(args.leaves):
+            leaves.run(board, Colour.RED, FILL)
+        rate = args.leaves * leaves.batch_size / (time.perf_counter() - start)
+        leaves.close()
+        print(f"{workers:>7} {leaves.batch_size:>6} {rate:>11.0f} {rate / base_rate:>7.2f}x")
+
+
+def bench_batch(args):
+    print(f"{'stones':>6} {'batch':>6} {'rollouts/s':>11} {'speedup':>8}")
+    for stones in args.stones:
+        board = random_position(args.board_size, stones, args.seed)
+        start = time.perf_counter()
+        for _ in range(args.rollouts):
+            rollout(FILL, board, Colour.RED)
+        base_rate = args.rollouts / (time.perf_counter() - start)
+        print(f"{stones:>6} {1:>6} {base_rate:>11.0f} {1:>7.2f}x")
+
+        for batch in args.batches:
+            batches = max(1, args.rollouts // batch)
+            start = time.perf_counter()
+            for _ in range(batches):
+                batch_fill_rollouts(board, Colour.RED, batch)
+            rate = batches * batch / (time.perf_counter() - start)
+            print(f"{stones:>6} {batch:>6} {rate:>11.0f} {rate / base_rate:>7.2f}x")
+
+
+def bench_threads(args):
+    # every mode searches until the same deadline
+    board = random_position(args.board_size, args.stones, args.seed)
+    gil = getattr(sys, "_is_gil_enabled", lambda: True)()
+    print(f"GIL {'enabled' if gil else 'disabled'}, {args.seconds:g}s per mode")
+    print(f"{'mode':<10} {'workers':>7} {'rollouts':>9} {'seconds':>8} {'speedup':>8}")
+
+    start = time.perf_counter()
+    base = build_node_tree(board, sys.maxsize, False, start + args.seconds).visits
+    elapsed = time.perf_counter() - start
+    print(f"{'serial':<10} {1:>7} {base:>9} {elapsed:>8.2f} {1:>7.2f}x")
+
+    for workers in args.workers:
+        search = TreeParallelSearch(workers)
+        root = Node(Colour.RED, board.bits.empty())
+        start = time.perf_counter()
+        rollouts = search.search(root, board, sys.maxsize, FILL, start + args.seconds)
+        elapsed = time.perf_counter() - start
+        search.close()
+        print(
+            f"{'threads':<10} {workers:>7} {rollouts:>9} {elapsed:>8.2f} "
+            f"{rollouts / base:>7.2f}x"
+        )
+
+    for workers in args.workers:
+        search = RootParallelSearch(workers)
+        search.search(board, Colour.RED, 1, FILL)  # warm up the workers
+        start = time.perf_counter()
+        search.search(board, Colour.RED, sys.maxsize, FILL, time_limit=args.seconds)
+        elapsed = time.perf_counter() - start
+        search.close()
+        print(
+            f"{'processes':<10} {workers:>7} {search.rollouts:>9} {elapsed:>8.2f} "
+            f"{search.rollouts / base:>7.2f}x"
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmarks for Group14 agents")
+    parser.add_argument("-b", "--board_size", type=int, default=11)
+    parser.add_argument("--seed", type=int, default=0)
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    hashing = commands.add_parser("hash", help="Engine anti-cheat overhead per turn")
+    hashing.add_argument("-n", "--turns", type=int, default=200)
+    hashing.set_defaults(run=bench_hash)
+
+    rollouts = commands.add_parser("rollouts", help="Rollouts per second per policy")
+    rollouts.add_argument("-n", "--rollouts", type=int, default=2000)
+    rollouts.add_argument("--stones", type=int, nargs="+", default=[0, 30, 60])
+    rollouts.set_defaults(run=bench_rollouts)
+
+    memory = commands.add_parser("memory", help="Memory per visited MCTS tree node")
+    memory.add_argument("-n", "--iterations", type=int, default=5000)
+    memory.add_argument("--stones", type=int, default=0)
+    memory.set_defaults(run=bench_memory)
+
+    expand = commands.add_parser("expand", help="Node expansions per second")
+    expand.add_argument("-n", "--repeats", type=int, default=20)
+    expand.add_argument("--sizes", type=int, nargs="+", default=[11, 19])
+    expand.set_defaults(run=bench_expand)
+
+    select = commands.add_parser("select", help="UCB1 selections per second at the root")
+    select.add_argument("-n", "--repeats", type=int, default=20000)
+    select.add_argument("--sizes", type=int, nargs="+", default=[11, 19])
+    select.set_defaults(run=bench_select)
+
+    parallel = commands.add_parser(
+        "parallel", help="Root-parallel search scaling with worker count"
+    )
+    parallel.add_argument("-n", "--iterations", type=int, default=2000)
+    parallel.add_argument("--moves", type=int, default=3)
+    parallel.add_argument("--stones", type=int, default=10)
+    parallel.add_argument("--workers", type=int, nargs="+", default=list(range(1, 9)))
+    parallel.set_defaults(run=bench_parallel)
+
+    leaf = commands.add_parser("leaf", help="Leaf-parallel rollouts per second")
+    leaf.add_argument("-n", "--leaves", type=int, default=200)
+    leaf.add_argument("-k", "--rollouts", type=int, default=16, help="rollouts per worker per leaf")
+    leaf.add_argument("--stones", type=int, default=10)
+    leaf.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    leaf.set_defaults(run=bench_leaf)
+
+    batch = commands.add_parser("batch", help="NumPy batched fill rollouts per second")
+    batch.add_argument("-n", "--rollouts", type=int, default=20000)
+    batch.add_argument("--stones", type=int, nargs="+", default=[0, 30, 60])
+    batch.add_argument("--batches", type=int, nargs="+", default=[64, 256, 1024])
+    batch.set_defaults(run=bench_batch)
+
+    threads = commands.add_parser(
+        "threads", help="Shared-tree threads vs root-parallel processes vs serial"
+    )
+    threads.add_argument("-t", "--seconds", type=float, default=2.0)
+    threads.add_argument("--stones", type=int, default=10)
+    threads.add_argument("--workers", type=int, nargs="+", default=[2, 4, 8])
+    threads.set_defaults(run=bench_threads)
+
+    args = parser.parse_args()
+    args.run(args)
+
+
+if __name__ == "__main__":
+    main()
@@ -5,6 +5,19 @@ from src.Board import Board
 from src.Colour import Colour
 from src.Move import Move
 
+# hash of each agent class's source, filled on first use by source_hash
+_SOURCE_HASHES: dict[type, int] = {}
+
+
+def source_hash(agent_class: type) -> int:
+    """Returns the hash of the source code of agent_class. Reading the source
+    means tokenising the whole file, so the result is memoised per class.
+    """
+
+    if agent_class not in _SOURCE_HASHES:
+        _SOURCE_HASHES[agent_class] = hash(inspect.getsource(agent_class))
+    return _SOURCE_HASHES[agent_class]
+
 
 class AgentBase(ABC):
     """This class describes the base agent class. All agents should inherit from this class."""
@@ -18,6 +31,12 @@ class AgentBase(ABC):
         """Makes a move based on the current board state."""
         pass
 
+    def end_game(self):
+        """Called by the engine once the match is over, whoever made the last
+        move. Agents that keep working between moves stop here.
+        """
+        pass
+
     @property
     def colour(self) -> Colour:
         return self._colour
@@ -39,4 +58,4 @@ class AgentBase(ABC):
             raise ValueError(f"Invalid colour: {self._colour}")
 
     def __hash__(self) -> int:
-        return hash(inspect.getsource(self.__class__))
+        return source_hash(self.__class__)
@@ -0,0 +1,142 @@
+from src.Colour import Colour
+from src.Geometry import Geometry
+
+
+class BitBoard:
+    """Compact Hex board that packs each colour's stones into the bits of a
+    Python int. Tile (x, y) is bit x * size + y of the red and blue masks.
+    """
+
+    _geometry: Geometry
+    red: int
+    blue: int
+
+    def __init__(self, board_size=11):
+        self._geometry = Geometry.of(board_size)
+        self.red = 0
+        self.blue = 0
+
+    def __eq__(self, value: object) -> bool:
+        if not isinstance(value, BitBoard):
+            return False
+
+        return (
+            self.size == value.size
+            and self.red == value.red
+            and self.blue == value.blue
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.size, self.red, self.blue))
+
+    @property
+    def size(self) -> int:
+        return self._geometry.size
+
+    @property
+    def geometry(self) -> Geometry:
+        return self._geometry
+
+    def get(self, x, y) -> Colour | None:
+        """Returns the colour of the stone on (x, y), or None if empty."""
+
+        bit = 1 << (x * self._geometry.size + y)
+        if self.red & bit:
+            return Colour.RED
+        if self.blue & bit:
+            return Colour.BLUE
+        return None
+
+    def set(self, x, y, colour) -> None:
+        """Places a stone of the given colour on (x, y), None clears it."""
+
+        bit = 1 << (x * self._geometry.size + y)
+        if colour == Colour.RED:
+            self.red |= bit
+            self.blue &= ~bit
+        elif colour == Colour.BLUE:
+            self.blue |= bit
+            self.red &= ~bit
+        else:
+            self.red &= ~bit
+            self.blue &= ~bit
+
+    def stones(self, colour: Colour) -> int:
+        """Returns the mask of cells occupied by the given colour."""
+
+        if colour == Colour.RED:
+            return self.red
+        elif colour == Colour.BLUE:
+            return self.blue
+        else:
+            raise ValueError("Invalid colour")
+
+    def empty(self) -> int:
+        """Returns the mask of unoccupied cells."""
+
+        return self._geometry.full & ~(self.red | self.blue)
+
+    def empty_cells(self) -> list[int]:
+        """Returns the indices of unoccupied cells in ascending order."""
+
+        occupied = self.red | self.blue
+        return [
+            cell
+            for cell in range(self._geometry.cells)
+            if not (occupied >> cell) & 1
+        ]
+
+    def connects(self, colour: Colour) -> bool:
+        """Checks whether the given colour joins its two sides, red from
+        top to bottom and blue from left to right. The reachable set is
+        grown from the start edge with whole-board shifts until it touches
+        the goal edge or stops changing.
+        """
+
+        geometry = self._geometry
+        if colour == Colour.RED:
+            stones = self.red
+            reached = stones & geometry.top_row
+            goal = geometry.bottom_row
+        elif colour == Colour.BLUE:
+            stones = self.blue
+            reached = stones & geometry.left_col
+            goal = geometry.right_col
+        else:
+            raise ValueError("Invalid colour")
+
+        while reached:
+            if reached & goal:
+                return True
+            grown = geometry.spread(reached) & stones
+            if grown == reached:
+                return False
+            reached = grown
+        return False
+
+    def to_bytes(self) -> bytes:
+        """Packs the position into bytes, the red mask followed by the blue
+        mask, ceil(cells / 8) bytes each. 32 bytes for an 11x11 board.
+        """
+
+        length = (self._geometry.cells + 7) // 8
+        return self.red.to_bytes(length, "little") + self.blue.to_bytes(length, "little")
+
+    @staticmethod
+    def from_bytes(board_size: int, data: bytes) -> "BitBoard":
+        """Unpacks a position packed by to_bytes."""
+
+        bits = BitBoard(board_size)
+        length = (bits._geometry.cells + 7) // 8
+        if len(data) != 2 * length:
+            raise ValueError("Packed board has the wrong length")
+        bits.red = int.from_bytes(data[:length], "little")
+        bits.blue = int.from_bytes(data[length:], "little")
+        return bits
+
+    def copy(self) -> "BitBoard":
+        new_bits = BitBoard.__new__(BitBoard)
+        new_bits._geometry = self._geometry
+        new_bits.red = self.red
+        new_bits.blue = self.blue
+        return new_bits
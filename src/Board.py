@@ -1,37 +1,74 @@
+from src.BitBoard import BitBoard
 from src.Colour import Colour
 from src.Tile import Tile
+from src.UnionFind import UnionFind
+
+
+class _BoardTile(Tile):
+    """Tile view whose colour lives in the owning board's bitboard."""
+
+    def __init__(self, board: "Board", x: int, y: int):
+        super().__init__(x, y)
+        self._board = board
+
+    @property
+    def colour(self):
+        return self._board._bits.get(self._x, self._y)
+
+    @colour.setter
+    def colour(self, colour):
+        self._board.set_tile_colour(self._x, self._y, colour)
+
+    # the dataclass methods inherited from Tile read the unused _colour
+    # field, so compare and print through the colour property instead
+    def __eq__(self, other):
+        if not isinstance(other, Tile):
+            return NotImplemented
+        return (self.x, self.y, self.colour, self.is_visited()) == (
+            other.x, other.y, other.colour, other.is_visited()
+        )
+
+    def __repr__(self) -> str:
+        return (
+            f"{Tile.__name__}(_x={self._x!r}, _y={self._y!r}, "
+            f"_colour={self.colour!r}, _visited={self._visited!r})"
+        )
 
 
 class Board:
-    """Class that describes the Hex board."""
+    """Class that describes the Hex board. Stones are stored in a BitBoard,
+    the tiles grid is a view over it built on first access. Chains are
+    tracked incrementally in a UnionFind so has_ended does not search, and
+    a Zobrist hash of the position is kept up to date by set_tile_colour.
+    """
 
     _size: int
-    _tiles: list[list[Tile]]
+    _bits: BitBoard
+    _tiles: list[list[Tile]] | None
+    _connectivity: UnionFind
+    _connectivity_stale: bool
+    _hash: int
     _winner: Colour | None
 
     def __init__(self, board_size=11):
         self._size = board_size
-
-        self._tiles = []
-        for i in range(board_size):
-            new_line = []
-            for j in range(board_size):
-                new_line.append(Tile(i, j))
-            self._tiles.append(new_line)
+        self._bits = BitBoard(board_size)
+        self._tiles = None
+        self._connectivity = UnionFind(board_size)
+        # set when a stone is removed or recoloured, which union-find
+        # cannot undo, so the forest is rebuilt on the next query
+        self._connectivity_stale = False
+        # xor of the Zobrist keys of every stone, 0 for the empty board
+        self._hash = 0
 
         self._winner = None
-        # store coordinates of winning path tiles
-        self._winning_path: set[tuple[int, int]] = set()
+        # coordinates of winning path tiles, computed on first access by
+        # get_winning_path and None until then
+        self._winning_path: set[tuple[int, int]] | None = None
 
 
     def __hash__(self) -> int:
-        # Flatten board colours into an immutable tuple
-        colours = tuple(
-            self._tiles[i][j].colour
-            for i in range(self._size)
-            for j in range(self._size)
-        )
-        return hash((self._size, colours))
+        return self._hash
 
 
     def __str__(self) -> str:
@@ -41,15 +78,10 @@ class Board:
         if not isinstance(value, Board):
             return False
 
-        if self._size != value.size:
+        if self._hash != value._hash:
             return False
 
-        for i in range(self._size):
-            for j in range(self._size):
-                if self.tiles[i][j].colour != value.tiles[i][j].colour:
-                    return False
-
-        return True
+        return self._bits == value._bits
 
     def from_string(string_input, board_size=11):
         """Loads a board from a string representation. If bnf=True, it will
@@ -73,92 +105,40 @@ class Board:
 
         # reset winner and path before search
         self._winner = None
-        self._winning_path.clear()
+        self._winning_path = None
 
-        # Red
-        if colour == Colour.RED:
-            for idx in range(self._size):
-                tile = self._tiles[0][idx]
-                if (
-                    not tile.is_visited()
-                    and tile.colour == Colour.RED
-                    and self._winner is None
-                ):
-                    self.DFS_colour(0, idx, Colour.RED)
-
-        # Blue
-        elif colour == Colour.BLUE:
-            for idx in range(self._size):
-                tile = self._tiles[idx][0]
-                if (
-                    not tile.is_visited()
-                    and tile.colour == Colour.BLUE
-                    and self._winner is None
-                ):
-                    self.DFS_colour(idx, 0, Colour.BLUE)
-        else:
+        if colour != Colour.RED and colour != Colour.BLUE:
             raise ValueError("Invalid colour")
 
-        # un-visit tiles for later use
-        self.clear_tiles()
+        if self._connectivity_stale:
+            self._connectivity = UnionFind.from_stones(
+                self._size, self._bits.red, self._bits.blue
+            )
+            self._connectivity_stale = False
 
-        # if winner found, compute shortest path
-        if self._winner is not None:
-            self._compute_shortest_winning_path(colour)
+        # the winning path is only computed if someone asks for it
+        if self._connectivity.connects(colour):
+            self._winner = colour
             return True
 
         return False
 
-    def clear_tiles(self):
-        """Clears the visited status from all tiles."""
-
-        for line in self._tiles:
-            for tile in line:
-                tile.clear_visit()
-
-    def DFS_colour(self, x, y, colour):
-        """DFS just to detect a win, not to store the path."""
-
-        self._tiles[x][y].visit()
-
-        # win conditions
-        if colour == Colour.RED:
-            if x == self._size - 1:
-                self._winner = colour
-        elif colour == Colour.BLUE:
-            if y == self._size - 1:
-                self._winner = colour
-        else:
-            return
-
-        # end condition
-        if self._winner is not None:
-            return
-
-        # visit neighbours
-        for idx in range(Tile.NEIGHBOUR_COUNT):
-            x_n = x + Tile.I_DISPLACEMENTS[idx]
-            y_n = y + Tile.J_DISPLACEMENTS[idx]
-            if 0 <= x_n < self._size and 0 <= y_n < self._size:
-                neighbour = self._tiles[x_n][y_n]
-                if not neighbour.is_visited() and neighbour.colour == colour:
-                    self.DFS_colour(x_n, y_n, colour)
-
     def print_board(self) -> str:
-        size = len(self._tiles)
+        size = self._size
         output = ""
 
         # Top red edge (column indices in red)
         output += "  " + "".join(Colour.red(f"{i:2d}")
                                  for i in range(size)) + "\n"
 
+        winning_path = self.get_winning_path()
         leading_spaces = ""
-        for row_index, line in enumerate(self._tiles):
+        for row_index, line in enumerate(self.tiles):
             # Left blue edge (row index in blue)
             output += " " + leading_spaces + Colour.blue(f"{row_index:2d}")
 
             for col_index, tile in enumerate(line):
-                if (row_index, col_index) in self._winning_path:
+                if (row_index, col_index) in winning_path:
                     # raw symbol
                     if tile.colour == Colour.RED:
                         base = "R"
@@ -184,84 +164,198 @@ class Board:
     def get_winner(self) -> Colour:
         return self._winner
 
+    def get_winning_path(self) -> set[tuple[int, int]]:
+        """Returns the tiles of a shortest chain for the winner found by the
+        last has_ended call, or an empty set if there is none. The path is
+        cached until the board changes.
+        """
+
+        if self._winner is None:
+            return set()
+        if self._winning_path is None:
+            self._compute_shortest_winning_path(self._winner)
+        return self._winning_path
+
     @property
     def size(self) -> int:
         return self._size
 
+    @property
+    def bits(self) -> BitBoard:
+        return self._bits
+
+    @property
+    def zobrist_key(self) -> int:
+        """The 64-bit Zobrist hash of the position. hash() of a board may
+        fold it to fewer bits, use this to index tables by position.
+        """
+        return self._hash
+
     @property
     def tiles(self) -> list[list[Tile]]:
+        if self._tiles is None:
+            self._tiles = [
+                [_BoardTile(self, i, j) for j in range(self._size)]
+                for i in range(self._size)
+            ]
         return self._tiles
 
     def set_tile_colour(self, x, y, colour) -> None:
-        self.tiles[x][y].colour = colour
+        previous = self._bits.get(x, y)
+        if previous == colour:
+            return
+
+        cell = x * self._size + y
+        zobrist = self._bits.geometry.zobrist
+        if previous is not None:
+            self._hash ^= zobrist[previous][cell]
+        if colour is not None:
+            self._hash ^= zobrist[colour][cell]
+
+        self._bits.set(x, y, colour)
+        self._winning_path = None
+        if previous is None:
+            self._connectivity.add_stone(cell, colour, self._bits.stones(colour))
+        else:
+            self._connectivity_stale = True
+
+    def copy(self) -> "Board":
+        """Returns an independent copy of the board. The stones, chains and
+        hash are copied in bulk rather than tile by tile.
+        """
+
+        new_board = Board.__new__(Board)
+        new_board._size = self._size
+        new_board._bits = self._bits.copy()
+        new_board._tiles = None
+        new_board._connectivity = self._connectivity.copy()
+        new_board._connectivity_stale = self._connectivity_stale
+        new_board._hash = self._hash
+        new_board._winner = self._winner
+        # the path is recomputed on demand rather than shared
+        new_board._winning_path = None
+        return new_board
+
+    def copy_into(self, dst: "Board") -> None:
+        """Overwrites dst with this board's position, reusing its storage.
+        Meant for loops that reset a scratch board many times.
+        """
+
+        if dst._size != self._size:
+            raise ValueError("Boards must be the same size")
+
+        dst._bits.red = self._bits.red
+        dst._bits.blue = self._bits.blue
+        self._connectivity.copy_into(dst._connectivity)
+        dst._connectivity_stale = self._connectivity_stale
+        dst._hash = self._hash
+        dst._winner = self._winner
+        dst._winning_path = None
+
+    @staticmethod
+    def from_stones(board_size: int, red: int, blue: int) -> "Board":
+        """Builds a board from red and blue stone masks, as held by
+        BitBoard, e.g. to rebuild a position in another process.
+        """
+
+        board = Board(board_size)
+        board._bits.red = red
+        board._bits.blue = blue
+        board._connectivity = UnionFind.from_stones(board_size, red, blue)
+
+        zobrist = board._bits.geometry.zobrist
+        for colour, stones in ((Colour.RED, red), (Colour.BLUE, blue)):
+            keys = zobrist[colour]
+            while stones:
+                low = stones & -stones
+                board._hash ^= keys[low.bit_length() - 1]
+                stones ^= low
+        return board
+
+    def snapshot(self) -> tuple:
+        """Returns a copy of the position that restore() can roll back to,
+        e.g. before playing out a rollout on this board.
+        """
+
+        return (
+            self._bits.red,
+            self._bits.blue,
+            self._connectivity.copy(),
+            self._connectivity_stale,
+            self._hash,
+        )
+
+    def restore(self, snapshot: tuple) -> None:
+        """Rolls the board back to a position returned by snapshot(). The
+        same snapshot can be restored any number of times.
+        """
+
+        red, blue, connectivity, stale, zobrist_hash = snapshot
+        self._bits.red = red
+        self._bits.blue = blue
+        self._connectivity = connectivity.copy()
+        self._connectivity_stale = stale
+        self._hash = zobrist_hash
+        self._winner = None
+        self._winning_path = None
 
     def _compute_shortest_winning_path(self, colour: Colour):
         """Use BFS to find a shortest connection between the two sides
-        for the winning colour and store it in _winning_path.
+        for the winning colour and store it in _winning_path. The search is
+        iterative, so long chains on large boards cannot hit the recursion
+        limit.
         """
 
-        from collections import deque
-
         size = self._size
-        visited: set[tuple[int, int]] = set()
-        parent: dict[tuple[int, int], tuple[int, int] | None] = {}
-        q: deque[tuple[int, int]] = deque()
+        cells = size * size
+        neighbours = self._bits.geometry.neighbours
+        stones = self._bits.stones(colour)
 
-        # initialise BFS sources depending on colour
+        # initialise BFS sources depending on colour, cells are flat
+        # row-major indices and the queue is a list walked by index
         if colour == Colour.RED:
             # top row sources
-            for y in range(size):
-                if self._tiles[0][y].colour == Colour.RED:
-                    q.append((0, y))
-                    visited.add((0, y))
-                    parent[(0, y)] = None
-        elif colour == Colour.BLUE:
-            # left column sources
-            for x in range(size):
-                if self._tiles[x][0].colour == Colour.BLUE:
-                    q.append((x, 0))
-                    visited.add((x, 0))
-                    parent[(x, 0)] = None
+            sources = range(size)
         else:
-            return
-
-        target: tuple[int, int] | None = None
-
-        while q:
-            x, y = q.popleft()
+            # left column sources
+            sources = range(0, cells, size)
+
+        parent = [-1] * cells
+        visited = 0
+        queue: list[int] = []
+        for cell in sources:
+            if (stones >> cell) & 1:
+                queue.append(cell)
+                visited |= 1 << cell
+
+        target = -1
+        head = 0
+        while head < len(queue):
+            cell = queue[head]
+            head += 1
 
             # goal test
-            if colour == Colour.RED and x == size - 1:
-                target = (x, y)
+            if colour == Colour.RED and cell >= cells - size:
+                target = cell
                 break
-            if colour == Colour.BLUE and y == size - 1:
-                target = (x, y)
+            if colour == Colour.BLUE and cell % size == size - 1:
+                target = cell
                 break
 
             # explore neighbours
-            for idx in range(Tile.NEIGHBOUR_COUNT):
-                x_n = x + Tile.I_DISPLACEMENTS[idx]
-                y_n = y + Tile.J_DISPLACEMENTS[idx]
-                if 0 <= x_n < size and 0 <= y_n < size:
-                    if (x_n, y_n) not in visited and \
-                       self._tiles[x_n][y_n].colour == colour:
-                        visited.add((x_n, y_n))
-                        parent[(x_n, y_n)] = (x, y)
-                        q.append((x_n, y_n))
+            for neighbour in neighbours[cell]:
+                bit = 1 << neighbour
+                if not visited & bit and stones & bit:
+                    visited |= bit
+                    parent[neighbour] = cell
+                    queue.append(neighbour)
 
         # reconstruct path if target reached
-        if target is not None:
-            path: list[tuple[int, int]] = []
-            cur: tuple[int, int] | None = target
-            while cur is not None:
-                path.append(cur)
-                cur = parent[cur]
-            path.reverse()
-            self._winning_path = set(path)
-        else:
-            # fallback: no path found; leave empty
-            self._winning_path.clear()
-
+        path: set[tuple[int, int]] = set()
+        while target != -1:
+            path.add(divmod(target, size))
+            target = parent[target]
+        self._winning_path = path
 
 if __name__ == "__main__":
     b = Board.from_string(
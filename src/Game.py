@@ -1,4 +1,3 @@
-import copy
 import logging
 import os
 import sys
@@ -139,11 +138,14 @@ class Game:
             logger.info(f"Starting Board:\n{str(self.board)}")
             currentPlayer.turn += 1
 
-            boardCopy = copy.deepcopy(self.board)
+            # copies take the stone masks as two ints plus flat O(cells)
+            # copies of the union-find lists, and __eq__ compares Zobrist
+            # hashes first
+            boardCopy = self.board.copy()
             turnCopy = self.turn
-            playerCopy = copy.deepcopy(self.players)
+            playerCopy = self._players_fingerprint()
 
-            playerBoard = copy.deepcopy(self.board)
+            playerBoard = self.board.copy()
 
             start = time()
             m = playerAgent.make_move(self.turn, playerBoard, opponentMove)
@@ -152,7 +154,7 @@ class Game:
             assert boardCopy == self.board, "Board was modified, Possible cheating!"
             assert turnCopy == self.turn, "Turn was modified, Possible cheating!"
             assert (
-                playerCopy == self.players
+                playerCopy == self._players_fingerprint()
             ), "Players were modified, Possible cheating!"
             assert end > start, "Move time is negative, Possible cheating!"
 
@@ -181,6 +183,23 @@ class Game:
             self.current_player = Colour.opposite(self.current_player)
         return self._end_game(endState)
 
+    def _players_fingerprint(self) -> tuple:
+        """Summarises the players for the anti-cheat check without copying
+        agents: the seat, name and move time of each player and the
+        identity and class source hash of its agent.
+        """
+
+        return tuple(
+            (
+                colour,
+                player.name,
+                player.move_time,
+                id(player.agent),
+                hash(player.agent),
+            )
+            for colour, player in self.players.items()
+        )
+
     def _make_move(self, m: Move):
         """Performs a valid move on the board, then prints its results."""
 
@@ -223,6 +242,9 @@ class Game:
         logger.info(f"Total time: {Game.ns_to_s(total_time)}s")
         winner = None
 
+        for p in self.players.values():
+            p.agent.end_game()
+
         match status:
             case EndState.WIN:
                 # last move overcounts
@@ -0,0 +1,156 @@
+import random
+
+from src.Colour import Colour
+from src.Move import Move
+from src.Tile import Tile
+
+
+class Geometry:
+    """Precomputed bit masks for a Hex board of a given size.
+
+    Cells are numbered row-major, so tile (x, y) is cell x * size + y and
+    bit (1 << cell) of a bitboard. Instances are shared between every board
+    of the same size, use Geometry.of(size) rather than the constructor.
+    """
+
+    _cache: dict[int, "Geometry"] = {}
+
+    size: int
+    cells: int
+    full: int
+    top_row: int
+    bottom_row: int
+    left_col: int
+    right_col: int
+    not_left_col: int
+    not_right_col: int
+    neighbour_masks: tuple[int, ...]
+    neighbours: tuple[tuple[int, ...], ...]
+    bridges: tuple[tuple[tuple[int, int, int], ...], ...]
+    bridge_carriers: tuple[tuple[tuple[int, int, int], ...], ...]
+    edge_templates: dict[Colour, tuple[tuple[tuple[int, int], ...], ...]]
+    moves: tuple[Move, ...]
+    zobrist: dict[Colour, tuple[int, ...]]
+
+    def __init__(self, size: int):
+        self.size = size
+        self.cells = size * size
+        self.full = (1 << self.cells) - 1
+
+        row = (1 << size) - 1
+        col = 0
+        for x in range(size):
+            col |= 1 << (x * size)
+
+        self.top_row = row
+        self.bottom_row = row << (size * (size - 1))
+        self.left_col = col
+        self.right_col = col << (size - 1)
+        self.not_left_col = self.full & ~self.left_col
+        self.not_right_col = self.full & ~self.right_col
+
+        masks = []
+        neighbours = []
+        for x in range(size):
+            for y in range(size):
+                cells = []
+                for idx in range(Tile.NEIGHBOUR_COUNT):
+                    x_n = x + Tile.I_DISPLACEMENTS[idx]
+                    y_n = y + Tile.J_DISPLACEMENTS[idx]
+                    if 0 <= x_n < size and 0 <= y_n < size:
+                        cells.append(x_n * size + y_n)
+                neighbours.append(tuple(cells))
+                masks.append(sum(1 << cell for cell in cells))
+        self.neighbour_masks = tuple(masks)
+        self.neighbours = tuple(neighbours)
+
+        # per cell, its bridge partners as (partner, carrier, carrier). The
+        # displacements go round the hexagon in order, so neighbours i and
+        # i + 1 carry the bridge to the cell at the sum of their offsets
+        count = Tile.NEIGHBOUR_COUNT
+        bridges = []
+        for x in range(size):
+            for y in range(size):
+                patterns = []
+                for idx in range(count):
+                    nxt = (idx + 1) % count
+                    di, dj = Tile.I_DISPLACEMENTS[idx], Tile.J_DISPLACEMENTS[idx]
+                    ni, nj = Tile.I_DISPLACEMENTS[nxt], Tile.J_DISPLACEMENTS[nxt]
+                    cells = ((x + di + ni, y + dj + nj), (x + di, y + dj), (x + ni, y + nj))
+                    if all(0 <= x_n < size and 0 <= y_n < size for x_n, y_n in cells):
+                        patterns.append(tuple(x_n * size + y_n for x_n, y_n in cells))
+                bridges.append(tuple(patterns))
+        self.bridges = tuple(bridges)
+
+        # per cell, the bridges it is a carrier of as (other carrier, end, end)
+        carriers = [[] for _ in range(self.cells)]
+        for cell, patterns in enumerate(bridges):
+            for partner, carrier, other in patterns:
+                if cell < partner:
+                    carriers[carrier].append((other, cell, partner))
+                    carriers[other].append((carrier, cell, partner))
+        self.bridge_carriers = tuple(tuple(patterns) for patterns in carriers)
+
+        # per colour and cell, the carrier pairs of the edge templates that
+        # join a stone on the second row to that colour's goal edge. Red
+        # joins the top and bottom rows, blue the left and right columns
+        red_edges = [[] for _ in range(self.cells)]
+        blue_edges = [[] for _ in range(self.cells)]
+        last = size - 1
+        if size > 2:
+            for k in range(size):
+                # (1, k) touches (0, k) and (0, k + 1) of the top row,
+                # (n - 2, k) touches (n - 1, k) and (n - 1, k - 1) of the
+                # bottom row, and the same transposed for blue
+                if k < last:
+                    red_edges[size + k].append((k, k + 1))
+                    blue_edges[k * size + 1].append((k * size, (k + 1) * size))
+                if k > 0:
+                    red_edges[(last - 1) * size + k].append(
+                        (last * size + k, last * size + k - 1)
+                    )
+                    blue_edges[k * size + last - 1].append(
+                        (k * size + last, (k - 1) * size + last)
+                    )
+        self.edge_templates = {
+            Colour.RED: tuple(tuple(pairs) for pairs in red_edges),
+            Colour.BLUE: tuple(tuple(pairs) for pairs in blue_edges),
+        }
+
+        # one shared Move per cell, Move is frozen so callers can hand these
+        # out instead of allocating
+        self.moves = tuple(Move(*divmod(cell, size)) for cell in range(self.cells))
+
+        # 64-bit Zobrist keys per (colour, cell), seeded by the size so every
+        # process derives the same keys for the same board
+        rng = random.Random(size)
+        self.zobrist = {
+            colour: tuple(rng.getrandbits(64) for _ in range(self.cells))
+            for colour in (Colour.RED, Colour.BLUE)
+        }
+
+    @classmethod
+    def of(cls, size: int) -> "Geometry":
+        """Returns the shared geometry for the given board size."""
+
+        geometry = cls._cache.get(size)
+        if geometry is None:
+            geometry = cls(size)
+            cls._cache[size] = geometry
+        return geometry
+
+    def spread(self, mask: int) -> int:
+        """Returns mask together with every cell adjacent to it."""
+
+        n = self.size
+        left = mask & self.not_left_col
+        right = mask & self.not_right_col
+        return (
+            mask
+            | (mask >> n)
+            | (mask << n)
+            | (right << 1)
+            | (left >> 1)
+            | (right >> (n - 1))
+            | (left << (n - 1))
+        ) & self.full
@@ -0,0 +1,127 @@
+from src.Colour import Colour
+from src.Geometry import Geometry
+
+
+class UnionFind:
+    """Disjoint-set forest over the cells of a board, with one virtual node
+    per board edge. Stones are joined to their same-coloured neighbours as
+    they are placed, so asking whether a colour has connected its sides is
+    two find calls instead of a search.
+
+    Nodes 0 .. cells - 1 are the cells in row-major order, followed by the
+    top, bottom, left and right edge nodes.
+    """
+
+    _geometry: Geometry
+    _parent: list[int]
+    _rank: list[int]
+
+    def __init__(self, board_size=11):
+        self._geometry = Geometry.of(board_size)
+        nodes = self._geometry.cells + 4
+        self._parent = list(range(nodes))
+        self._rank = [0] * nodes
+
+    @property
+    def top(self) -> int:
+        return self._geometry.cells
+
+    @property
+    def bottom(self) -> int:
+        return self._geometry.cells + 1
+
+    @property
+    def left(self) -> int:
+        return self._geometry.cells + 2
+
+    @property
+    def right(self) -> int:
+        return self._geometry.cells + 3
+
+    def find(self, node: int) -> int:
+        """Returns the representative of node's set, halving the path."""
+
+        parent = self._parent
+        while parent[node] != node:
+            parent[node] = parent[parent[node]]
+            node = parent[node]
+        return node
+
+    def union(self, a: int, b: int) -> None:
+        """Merges the sets containing a and b, by rank."""
+
+        root_a = self.find(a)
+        root_b = self.find(b)
+        if root_a == root_b:
+            return
+
+        rank = self._rank
+        if rank[root_a] < rank[root_b]:
+            root_a, root_b = root_b, root_a
+        self._parent[root_b] = root_a
+        if rank[root_a] == rank[root_b]:
+            rank[root_a] += 1
+
+    def add_stone(self, cell: int, colour: Colour, stones: int) -> None:
+        """Joins a newly placed stone to its edges and to its neighbours in
+        stones, the mask of cells already held by the same colour.
+        """
+
+        geometry = self._geometry
+        size = geometry.size
+        x, y = divmod(cell, size)
+
+        if colour == Colour.RED:
+            if x == 0:
+                self.union(cell, self.top)
+            if x == size - 1:
+                self.union(cell, self.bottom)
+        elif colour == Colour.BLUE:
+            if y == 0:
+                self.union(cell, self.left)
+            if y == size - 1:
+                self.union(cell, self.right)
+        else:
+            raise ValueError("Invalid colour")
+
+        for neighbour in geometry.neighbours[cell]:
+            if (stones >> neighbour) & 1:
+                self.union(cell, neighbour)
+
+    def connects(self, colour: Colour) -> bool:
+        """Checks whether the given colour joins its two edges."""
+
+        if colour == Colour.RED:
+            return self.find(self.top) == self.find(self.bottom)
+        elif colour == Colour.BLUE:
+            return self.find(self.left) == self.find(self.right)
+        else:
+            raise ValueError("Invalid colour")
+
+    def copy(self) -> "UnionFind":
+        new_uf = UnionFind.__new__(UnionFind)
+        new_uf._geometry = self._geometry
+        new_uf._parent = self._parent[:]
+        new_uf._rank = self._rank[:]
+        return new_uf
+
+    def copy_into(self, dst: "UnionFind") -> None:
+        """Overwrites dst, a forest of the same size, with this one without
+        allocating new lists.
+        """
+
+        dst._parent[:] = self._parent
+        dst._rank[:] = self._rank
+
+    @staticmethod
+    def from_stones(board_size: int, red: int, blue: int) -> "UnionFind":
+        """Builds the forest for a position given as red and blue masks."""
+
+        uf = UnionFind(board_size)
+        for colour, stones in ((Colour.RED, red), (Colour.BLUE, blue)):
+            remaining = stones
+            while remaining:
+                low = remaining & -remaining
+                uf.add_stone(low.bit_length() - 1, colour, stones)
+                remaining ^= low
+        return uf
@@ -0,0 +1,39 @@
+import inspect
+import unittest
+from unittest.mock import patch
+
+import src.AgentBase
+from agents.TestAgents.ValidAgent import ValidAgent
+from src.AgentBase import source_hash
+from src.Colour import Colour
+from src.Game import Game
+from src.Player import Player
+
+
+class TestAgentBase(unittest.TestCase):
+    def setUp(self):
+        self.agent = ValidAgent(Colour.RED)
+
+    def test_hash_is_source_hash(self):
+        self.assertEqual(hash(self.agent), hash(inspect.getsource(ValidAgent)))
+        self.assertEqual(hash(self.agent), hash(ValidAgent(Colour.BLUE)))
+
+    def test_source_hash_memoised(self):
+        source_hash(ValidAgent)
+        self.assertIn(ValidAgent, src.AgentBase._SOURCE_HASHES)
+        self.assertEqual(source_hash(ValidAgent), hash(self.agent))
+
+    def test_fingerprint_reads_source_once(self):
+        game = Game(
+            Player("Player1", ValidAgent(Colour.RED)),
+            Player("Player2", ValidAgent(Colour.BLUE)),
+        )
+        src.AgentBase._SOURCE_HASHES.clear()
+        with patch("inspect.getsource", wraps=inspect.getsource) as getsource:
+            for _ in range(10):
+                game._players_fingerprint()
+        self.assertEqual(getsource.call_count, 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,124 @@
+import unittest
+
+from src.BitBoard import BitBoard
+from src.Board import Board
+from src.Colour import Colour
+from src.Geometry import Geometry
+from src.Move import Move
+
+
+class TestBitBoard(unittest.TestCase):
+    def setUp(self):
+        self.bits = BitBoard(11)
+
+    def test_set_and_get(self):
+        self.bits.set(3, 4, Colour.RED)
+        self.bits.set(4, 3, Colour.BLUE)
+        self.assertEqual(self.bits.get(3, 4), Colour.RED)
+        self.assertEqual(self.bits.get(4, 3), Colour.BLUE)
+        self.assertIsNone(self.bits.get(0, 0))
+
+    def test_overwrite_and_clear(self):
+        self.bits.set(2, 2, Colour.RED)
+        self.bits.set(2, 2, Colour.BLUE)
+        self.assertEqual(self.bits.get(2, 2), Colour.BLUE)
+        self.assertEqual(self.bits.red, 0)
+        self.bits.set(2, 2, None)
+        self.assertIsNone(self.bits.get(2, 2))
+        self.assertEqual(self.bits.empty(), Geometry.of(11).full)
+
+    def test_connects_red_diagonal_chain(self):
+        # (i, 5 - i) steps along the (1, -1) neighbour direction
+        bits = BitBoard(6)
+        for i in range(6):
+            bits.set(i, 5 - i, Colour.RED)
+        self.assertTrue(bits.connects(Colour.RED))
+        self.assertFalse(bits.connects(Colour.BLUE))
+
+    def test_connects_blue_needs_adjacency(self):
+        bits = BitBoard(5)
+        for j in range(5):
+            bits.set(2, j, Colour.BLUE)
+        self.assertTrue(bits.connects(Colour.BLUE))
+        bits.set(2, 2, Colour.RED)
+        self.assertFalse(bits.connects(Colour.BLUE))
+        # (1, 2) and (1, 3) do not wrap across rows
+        bits.set(1, 2, Colour.BLUE)
+        bits.set(1, 3, Colour.BLUE)
+        self.assertTrue(bits.connects(Colour.BLUE))
+
+    def test_no_wrap_between_rows(self):
+        bits = BitBoard(4)
+        # last cell of row 0 and first cell of row 1 are not neighbours
+        bits.set(0, 3, Colour.RED)
+        bits.set(1, 0, Colour.RED)
+        for x in range(2, 4):
+            bits.set(x, 0, Colour.RED)
+        self.assertFalse(bits.connects(Colour.RED))
+
+    def test_neighbour_masks(self):
+        geometry = Geometry.of(11)
+        self.assertEqual(bin(geometry.neighbour_masks[0]).count("1"), 2)
+        self.assertEqual(bin(geometry.neighbour_masks[5 * 11 + 5]).count("1"), 6)
+        centre = 1 << (5 * 11 + 5)
+        self.assertEqual(geometry.spread(centre), centre | geometry.neighbour_masks[60])
+
+    def test_moves_follow_cell_order(self):
+        geometry = Geometry.of(11)
+        self.assertEqual(len(geometry.moves), 121)
+        self.assertEqual(geometry.moves[3 * 11 + 7], Move(3, 7))
+
+    def test_bridges(self):
+        geometry = Geometry.of(11)
+        # (5, 5) to (6, 6) is carried by (5, 6) and (6, 5)
+        self.assertIn((6 * 11 + 6, 5 * 11 + 6, 6 * 11 + 5), geometry.bridges[60])
+        self.assertEqual(len(geometry.bridges[60]), 6)
+        for cell, patterns in enumerate(geometry.bridges):
+            for partner, carrier, other in patterns:
+                self.assertIn(cell, [end for end, _, _ in geometry.bridges[partner]])
+                self.assertNotIn(partner, geometry.neighbours[cell])
+                self.assertIn(other, geometry.neighbours[carrier])
+
+    def test_edge_templates(self):
+        geometry = Geometry.of(11)
+        templates = geometry.edge_templates
+        # (1, 4) reaches the top row through (0, 4) and (0, 5)
+        self.assertEqual(templates[Colour.RED][1 * 11 + 4], ((4, 5),))
+        # (4, 9) reaches the right column through (4, 10) and (3, 10)
+        self.assertEqual(templates[Colour.BLUE][4 * 11 + 9], ((4 * 11 + 10, 3 * 11 + 10),))
+        self.assertEqual(templates[Colour.RED][4 * 11 + 9], ())
+        self.assertEqual(templates[Colour.BLUE][60], ())
+
+    def test_bridge_carriers(self):
+        geometry = Geometry.of(11)
+        # the centre carries six bridges, a corner none
+        self.assertEqual(len(geometry.bridge_carriers[60]), 6)
+        self.assertEqual(geometry.bridge_carriers[0], ())
+        for cell, patterns in enumerate(geometry.bridge_carriers):
+            for other, end, far_end in patterns:
+                # both carriers touch both ends, the ends do not touch
+                for carrier in (cell, other):
+                    self.assertIn(end, geometry.neighbours[carrier])
+                    self.assertIn(far_end, geometry.neighbours[carrier])
+                self.assertNotIn(far_end, geometry.neighbours[end])
+
+    def test_bytes_round_trip(self):
+        self.bits.set(0, 0, Colour.RED)
+        self.bits.set(10, 10, Colour.BLUE)
+        self.bits.set(4, 7, Colour.BLUE)
+        data = self.bits.to_bytes()
+        self.assertEqual(len(data), 32)
+        self.assertEqual(BitBoard.from_bytes(11, data), self.bits)
+        with self.assertRaises(ValueError):
+            BitBoard.from_bytes(11, data[:-1])
+
+    def test_board_uses_bitboard(self):
+        board = Board(11)
+        board.tiles[1][2].colour = Colour.BLUE
+        board.set_tile_colour(3, 3, Colour.RED)
+        self.assertEqual(board.bits.get(1, 2), Colour.BLUE)
+        self.assertEqual(board.tiles[3][3].colour, Colour.RED)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -2,6 +2,8 @@ import unittest
 
 from src.Board import Board
 from src.Colour import Colour
+from src.Geometry import Geometry
+from src.Tile import Tile
 
 # NOTE: LLM generated tests not checked by human
 
@@ -18,6 +20,14 @@ class TestBoard(unittest.TestCase):
         self.board.set_tile_colour(0, 0, Colour.RED)
         self.assertEqual(self.board.tiles[0][0].colour, Colour.RED)
 
+    def test_tile_equality_follows_board(self):
+        other = Board(11)
+        self.board.set_tile_colour(0, 0, Colour.RED)
+        other.set_tile_colour(0, 0, Colour.BLUE)
+        self.assertNotEqual(self.board.tiles[0][0], other.tiles[0][0])
+        self.assertEqual(self.board.tiles[0][0], Tile(0, 0, Colour.RED))
+        self.assertIn("_colour=<Colour.RED: 0>", repr(self.board.tiles[0][0]))
+
     def test_from_string(self):
         board_str = "R B 0\nB R 0\n0 0 0"
         board = Board.from_string(board_str, board_size=3)
@@ -44,6 +54,157 @@ class TestBoard(unittest.TestCase):
         board1.set_tile_colour(0, 0, Colour.RED)
         self.assertNotEqual(board1, board2)
 
+    def test_hash_incremental(self):
+        board1 = Board(11)
+        board2 = Board(11)
+        self.assertEqual(hash(board1), 0)
+        board1.set_tile_colour(1, 2, Colour.RED)
+        board1.set_tile_colour(3, 4, Colour.BLUE)
+        board2.set_tile_colour(3, 4, Colour.BLUE)
+        board2.set_tile_colour(1, 2, Colour.BLUE)
+        self.assertNotEqual(hash(board1), hash(board2))
+        self.assertNotEqual(board1, board2)
+        # transposed move order and a recoloured stone reach the same key
+        board2.set_tile_colour(1, 2, Colour.RED)
+        self.assertEqual(hash(board1), hash(board2))
+        self.assertEqual(board1, board2)
+        self.assertEqual(len({board1, board2}), 1)
+        board1.set_tile_colour(1, 2, None)
+        board1.set_tile_colour(3, 4, None)
+        self.assertEqual(hash(board1), 0)
+
+    def test_has_ended_after_stone_removed(self):
+        for i in range(11):
+            self.board.set_tile_colour(i, 0, Colour.RED)
+        self.board.set_tile_colour(5, 0, None)
+        self.assertFalse(self.board.has_ended(Colour.RED))
+        self.board.set_tile_colour(5, 0, Colour.BLUE)
+        self.assertFalse(self.board.has_ended(Colour.RED))
+        self.board.set_tile_colour(5, 0, Colour.RED)
+        self.assertTrue(self.board.has_ended(Colour.RED))
+
+    def test_snapshot_restore(self):
+        for i in range(10):
+            self.board.set_tile_colour(i, 3, Colour.RED)
+        snapshot = self.board.snapshot()
+        position_hash = hash(self.board)
+        for _ in range(2):
+            self.board.set_tile_colour(10, 3, Colour.RED)
+            self.assertTrue(self.board.has_ended(Colour.RED))
+            self.board.restore(snapshot)
+            self.assertEqual(hash(self.board), position_hash)
+            self.assertIsNone(self.board.tiles[10][3].colour)
+            self.assertFalse(self.board.has_ended(Colour.RED))
+
+    def test_winning_path_is_lazy(self):
+        for i in range(11):
+            self.board.set_tile_colour(i, 0, Colour.RED)
+        self.assertTrue(self.board.has_ended(Colour.RED))
+        self.assertIsNone(self.board._winning_path)
+        path = {(i, 0) for i in range(11)}
+        self.assertEqual(self.board.get_winning_path(), path)
+        self.assertIs(self.board.get_winning_path(), self.board.get_winning_path())
+
+        # rerouting the chain end invalidates the cached path
+        self.board.set_tile_colour(10, 0, None)
+        self.board.set_tile_colour(9, 1, Colour.RED)
+        self.board.set_tile_colour(10, 1, Colour.RED)
+        self.assertIsNone(self.board._winning_path)
+        self.assertIn((10, 1), self.board.get_winning_path())
+
+    def test_winning_path_empty_without_winner(self):
+        self.assertFalse(self.board.has_ended(Colour.BLUE))
+        self.assertEqual(self.board.get_winning_path(), set())
+
+    def test_copy(self):
+        for i in range(10):
+            self.board.set_tile_colour(i, 4, Colour.BLUE)
+        copy = self.board.copy()
+        self.assertEqual(copy, self.board)
+        self.assertEqual(hash(copy), hash(self.board))
+
+        copy.set_tile_colour(10, 4, Colour.BLUE)
+        copy.set_tile_colour(0, 0, Colour.RED)
+        self.assertIsNone(self.board.tiles[0][0].colour)
+        self.assertNotEqual(copy, self.board)
+        self.assertFalse(self.board.has_ended(Colour.BLUE))
+        self.assertFalse(copy.has_ended(Colour.BLUE))
+        for j in range(11):
+            copy.set_tile_colour(5, j, Colour.BLUE)
+        self.assertTrue(copy.has_ended(Colour.BLUE))
+        self.assertFalse(self.board.has_ended(Colour.BLUE))
+
+    def test_copy_into(self):
+        scratch = Board(11)
+        tile = scratch.tiles[3][3]
+        for i in range(11):
+            self.board.set_tile_colour(i, 3, Colour.RED)
+        self.board.copy_into(scratch)
+        self.assertEqual(scratch, self.board)
+        self.assertTrue(scratch.has_ended(Colour.RED))
+        # existing tile views keep working after the copy
+        self.assertEqual(tile.colour, Colour.RED)
+
+        Board(11).copy_into(scratch)
+        self.assertIsNone(tile.colour)
+        self.assertFalse(scratch.has_ended(Colour.RED))
+        with self.assertRaises(ValueError):
+            Board(5).copy_into(scratch)
+
+    def test_copies_own_winning_path(self):
+        for i in range(11):
+            self.board.set_tile_colour(i, 0, Colour.RED)
+        self.assertTrue(self.board.has_ended(Colour.RED))
+        path = self.board.get_winning_path()
+        scratch = Board(11)
+        self.board.copy_into(scratch)
+        for other in (self.board.copy(), scratch):
+            self.assertEqual(other.get_winning_path(), path)
+            self.assertIsNot(other.get_winning_path(), path)
+
+    def test_zobrist_key(self):
+        geometry = Geometry.of(11)
+        self.board.set_tile_colour(1, 2, Colour.RED)
+        self.board.set_tile_colour(3, 4, Colour.BLUE)
+        expected = geometry.zobrist[Colour.RED][13] ^ geometry.zobrist[Colour.BLUE][37]
+        self.assertEqual(self.board.zobrist_key, expected)
+        self.assertEqual(Board(11).zobrist_key, 0)
+
+    def test_from_stones(self):
+        for i in range(11):
+            self.board.set_tile_colour(i, 6, Colour.RED)
+        self.board.set_tile_colour(2, 2, Colour.BLUE)
+        bits = self.board.bits
+        rebuilt = Board.from_stones(11, bits.red, bits.blue)
+        self.assertEqual(rebuilt, self.board)
+        self.assertEqual(hash(rebuilt), hash(self.board))
+        self.assertTrue(rebuilt.has_ended(Colour.RED))
+        self.assertFalse(rebuilt.has_ended(Colour.BLUE))
+
+    def snake_board(self, size):
+        """Red chain zigzagging across every other row from top to bottom."""
+
+        board = Board(size)
+        for x in range(0, size, 2):
+            for y in range(size):
+                board.set_tile_colour(x, y, Colour.RED)
+            if x + 1 < size:
+                y = size - 1 if (x // 2) % 2 == 0 else 0
+                board.set_tile_colour(x + 1, y, Colour.RED)
+        return board
+
+    def test_has_ended_long_chain_large_boards(self):
+        for size in (19, 25, 51):
+            board = self.snake_board(size)
+            self.assertTrue(board.has_ended(Colour.RED))
+            # the path runs the full length of every inner row
+            self.assertGreater(len(board.get_winning_path()), size * (size // 2 - 1))
+            self.assertFalse(board.has_ended(Colour.BLUE))
+
+            # cutting the chain forces a rebuild from the bitboard
+            board.set_tile_colour(1, size - 1, Colour.BLUE)
+            self.assertFalse(board.has_ended(Colour.RED))
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -39,6 +39,37 @@ class TestGame(unittest.TestCase):
         self.assertEqual(result["player2_move_time"], 380)
         self.assertEqual(result["total_game_time"], 500)
 
+    def test_agent_gets_own_board(self):
+        def make_move(turn, board, opp_move):
+            board.set_tile_colour(5, 5, Colour.BLUE)
+            return Move(0, 0)
+
+        # player 1 repeats its move on turn 3, which ends the game
+        self.player1.agent.make_move.side_effect = make_move
+        self.player2.agent.make_move.return_value = Move(1, 1)
+        result = self.game._play()
+        self.assertEqual(result["win_method"], "BAD_MOVE")
+        self.assertIsNone(self.board.tiles[5][5].colour)
+        self.assertEqual(self.board.tiles[0][0].colour, Colour.RED)
+
+    def test_play_detects_board_tampering(self):
+        def make_move(turn, board, opp_move):
+            self.game.board.set_tile_colour(5, 5, Colour.RED)
+            return Move(0, 0)
+
+        self.player1.agent.make_move.side_effect = make_move
+        with self.assertRaisesRegex(AssertionError, "Board was modified"):
+            self.game._play()
+
+    def test_play_detects_player_tampering(self):
+        def make_move(turn, board, opp_move):
+            self.player2.move_time = -10**12
+            return Move(0, 0)
+
+        self.player1.agent.make_move.side_effect = make_move
+        with self.assertRaisesRegex(AssertionError, "Players were modified"):
+            self.game._play()
+
     def test_make_move(self):
         move = Move(0, 0)
         self.game._make_move(move)
@@ -67,6 +98,11 @@ class TestGame(unittest.TestCase):
         self.assertEqual(result["winner"], "Player1")
         self.assertEqual(result["win_method"], "TIMEOUT")
 
+    def test_end_game_notifies_agents(self):
+        self.game._end_game(EndState.WIN)
+        self.player1.agent.end_game.assert_called_once_with()
+        self.player2.agent.end_game.assert_called_once_with()
+
     def test_ns_to_s(self):
         self.assertEqual(Game.ns_to_s(1e9), 1.0)
         self.assertEqual(Game.ns_to_s(1.5e9), 1.5)
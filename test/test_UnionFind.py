@@ -0,0 +1,45 @@
+import unittest
+
+from src.Colour import Colour
+from src.UnionFind import UnionFind
+
+
+class TestUnionFind(unittest.TestCase):
+    def setUp(self):
+        self.uf = UnionFind(3)
+
+    def test_single_stone_joins_edges(self):
+        # a one-cell column on a 1x1 board touches both red edges
+        uf = UnionFind(1)
+        uf.add_stone(0, Colour.RED, 1)
+        self.assertTrue(uf.connects(Colour.RED))
+        self.assertFalse(uf.connects(Colour.BLUE))
+
+    def test_chain_connects(self):
+        stones = 0
+        for cell in (1, 4, 7):
+            stones |= 1 << cell
+            self.uf.add_stone(cell, Colour.RED, stones)
+        self.assertTrue(self.uf.connects(Colour.RED))
+
+    def test_gap_does_not_connect(self):
+        stones = (1 << 0) | (1 << 8)
+        self.uf.add_stone(0, Colour.BLUE, stones)
+        self.uf.add_stone(8, Colour.BLUE, stones)
+        self.assertFalse(self.uf.connects(Colour.BLUE))
+        self.assertNotEqual(self.uf.find(0), self.uf.find(8))
+
+    def test_copy_is_independent(self):
+        copy = self.uf.copy()
+        self.uf.add_stone(0, Colour.BLUE, 1)
+        self.assertEqual(self.uf.find(0), self.uf.find(self.uf.left))
+        self.assertNotEqual(copy.find(0), copy.find(copy.left))
+
+    def test_from_stones(self):
+        red = (1 << 2) | (1 << 4) | (1 << 6)
+        uf = UnionFind.from_stones(3, red, 0)
+        self.assertTrue(uf.connects(Colour.RED))
+
+
+if __name__ == "__main__":
+    unittest.main()